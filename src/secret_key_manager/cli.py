@@ -2,7 +2,10 @@
 
 import sys
 import argparse
+import functools
 import logging
+import shlex
+from typing import Callable, Dict
 
 # Import all providers to ensure they're registered
 from secret_key_manager import keys
@@ -14,8 +17,9 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=None)
 def setup_argparse() -> argparse.ArgumentParser:
-    """Set up command-line argument parser."""
+    """Set up command-line argument parser (built once and reused)."""
     parser = argparse.ArgumentParser(
         description="Secret Key Manager command-line interface",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
@@ -110,6 +114,13 @@ def setup_argparse() -> argparse.ArgumentParser:
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
     )
 
+    # 'repl' command
+    subparsers.add_parser(
+        "repl",
+        help="Run commands read from stdin, one per line, in a single process",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+
     return parser
 
 
@@ -122,7 +133,9 @@ def handle_get_command(args: argparse.Namespace) -> int:
     else:
         providers_tried = args.provider if args.provider else keys.get_providers()
         logger.error(
-            f"Key '{args.key_name}' not found in any of the providers: {', '.join(providers_tried)}"
+            "Key '%s' not found in any of the providers: %s",
+            args.key_name,
+            ", ".join(providers_tried),
         )
         return 1
 
@@ -144,7 +157,7 @@ def handle_set_command(args: argparse.Namespace) -> int:
             logger.warning("No writable providers available")
             if args.provider:
                 logger.error(
-                    f"Specified providers {args.provider} do not support writing"
+                    "Specified providers %s do not support writing", args.provider
                 )
                 return 1
             else:
@@ -167,7 +180,7 @@ def handle_set_command(args: argparse.Namespace) -> int:
             print("Key stored in memory only (not persisted)")
         return 0
     else:
-        logger.error(f"Failed to persist key '{args.key_name}'")
+        logger.error("Failed to persist key '%s'", args.key_name)
         return 1
 
 
@@ -192,7 +205,7 @@ def handle_providers_enable_command(args: argparse.Namespace) -> int:
         print(f"Provider '{args.name}' enabled")
         return 0
     else:
-        logger.error(f"Provider '{args.name}' not found")
+        logger.error("Provider '%s' not found", args.name)
         return 1
 
 
@@ -202,7 +215,7 @@ def handle_providers_disable_command(args: argparse.Namespace) -> int:
         print(f"Provider '{args.name}' disabled")
         return 0
     else:
-        logger.error(f"Provider '{args.name}' not found")
+        logger.error("Provider '%s' not found", args.name)
         return 1
 
 
@@ -217,24 +230,36 @@ def handle_providers_status_command(args: argparse.Namespace) -> int:
     print("Provider status:")
 
     # Find the maximum length for nice formatting
-    max_name_length = (
-        max([len(name) for name in provider_status.keys()]) if provider_status else 0
+    max_name_length = max((len(name) for name in provider_status), default=0)
+
+    # Build the row format once with the name column width fixed
+    row_fmt = (
+        "  {name:" + str(max_name_length) + "}  {priority:<10}  {status:<10}  "
+        "{writable:<10}  {cls}"
     )
 
     # Print status table header
     print(
-        f"  {'PROVIDER':{max_name_length}}  {'PRIORITY':<10}  {'STATUS':<10}  {'WRITABLE':<10}  {'CLASS'}"
+        row_fmt.format(
+            name="PROVIDER",
+            priority="PRIORITY",
+            status="STATUS",
+            writable="WRITABLE",
+            cls="CLASS",
+        )
     )
     print(f"  {'-' * max_name_length}  {'-' * 10}  {'-' * 10}  {'-' * 10}  {'-' * 20}")
 
-    # Sort by priority
-    sorted_providers = sorted(provider_status.items(), key=lambda x: x[1]["priority"])
-
-    for name, info in sorted_providers:
-        status = "Enabled" if info["enabled"] else "Disabled"
-        writable = "Yes" if info.get("supports_write", False) else "No"
+    # Status entries are already ordered by priority
+    for name, info in provider_status.items():
         print(
-            f"  {name:{max_name_length}}  {info['priority']:<10}  {status:<10}  {writable:<10}  {info['class']}"
+            row_fmt.format(
+                name=name,
+                priority=info["priority"],
+                status="Enabled" if info["enabled"] else "Disabled",
+                writable="Yes" if info.get("supports_write", False) else "No",
+                cls=info["class"],
+            )
         )
 
     return 0
@@ -255,25 +280,80 @@ def handle_providers_writable_command(args: argparse.Namespace) -> int:
     return 0
 
 
+# Handlers for the 'providers' subcommands
+_PROVIDER_COMMANDS: Dict[str, Callable[[argparse.Namespace], int]] = {
+    "list": handle_providers_list_command,
+    "enable": handle_providers_enable_command,
+    "disable": handle_providers_disable_command,
+    "status": handle_providers_status_command,
+    "writable": handle_providers_writable_command,
+}
+
+
 def handle_providers_command(args: argparse.Namespace) -> int:
     """Handle the 'providers' command and its subcommands."""
     if not args.providers_command:
         logger.error("No providers subcommand specified")
         return 1
 
-    if args.providers_command == "list":
-        return handle_providers_list_command(args)
-    elif args.providers_command == "enable":
-        return handle_providers_enable_command(args)
-    elif args.providers_command == "disable":
-        return handle_providers_disable_command(args)
-    elif args.providers_command == "status":
-        return handle_providers_status_command(args)
-    elif args.providers_command == "writable":
-        return handle_providers_writable_command(args)
-    else:
-        logger.error(f"Unknown providers subcommand: {args.providers_command}")
+    handler = _PROVIDER_COMMANDS.get(args.providers_command)
+    if handler is None:
+        logger.error("Unknown providers subcommand: %s", args.providers_command)
         return 1
+    return handler(args)
+
+
+def handle_repl_command(args: argparse.Namespace) -> int:
+    """
+    Handle the 'repl' command.
+
+    Each line of stdin is run as if it were passed to skm, reusing this
+    process, its parser and its providers instead of starting a new one.
+
+    Returns:
+        0 if every command succeeded, 1 otherwise
+    """
+    parser = setup_argparse()
+    status = 0
+
+    for line in sys.stdin:
+        try:
+            argv = shlex.split(line, comments=True)
+        except ValueError as e:
+            logger.error("Could not parse command %r: %s", line.strip(), e)
+            status = 1
+            continue
+        if not argv:
+            continue
+
+        try:
+            line_args = parser.parse_args(argv)
+        except SystemExit:
+            # argparse has already printed the error or help text
+            status = 1
+            continue
+
+        handler = _COMMANDS.get(line_args.command)
+        if handler is None or handler is handle_repl_command:
+            logger.error("Unsupported command in repl: %s", line.strip())
+            status = 1
+            continue
+
+        if handler(line_args) != 0:
+            status = 1
+        # Let a reading process see each result as soon as it is ready
+        sys.stdout.flush()
+
+    return status
+
+
+# Handlers for the top-level commands
+_COMMANDS: Dict[str, Callable[[argparse.Namespace], int]] = {
+    "get": handle_get_command,
+    "set": handle_set_command,
+    "providers": handle_providers_command,
+    "repl": handle_repl_command,
+}
 
 
 def main() -> int:
@@ -285,22 +365,21 @@ def main() -> int:
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
 
+    # The CLI exits right away, so exporting keys to its environment is wasted work
+    keys.propagate_env = False
+
     # If no command is specified, show help
     if not args.command:
         parser.print_help()
         return 1
 
     # Handle commands
-    if args.command == "get":
-        return handle_get_command(args)
-    elif args.command == "set":
-        return handle_set_command(args)
-    elif args.command == "providers":
-        return handle_providers_command(args)
-    else:
-        logger.error(f"Unknown command: {args.command}")
+    handler = _COMMANDS.get(args.command)
+    if handler is None:
+        logger.error("Unknown command: %s", args.command)
         parser.print_help()
         return 1
+    return handler(args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,76 @@
+"""Helpers for running blocking provider lookups concurrently."""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Iterable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def fetch_concurrently(
+    fetch: Callable[[str], Optional[str]],
+    key_names: Iterable[str],
+    max_workers: int = 32,
+) -> Dict[str, str]:
+    """
+    Look up several keys at once, one worker thread per key.
+
+    Meant for providers whose lookups block on a subprocess or the network,
+    so the batch takes about as long as the slowest single lookup.
+
+    Args:
+        fetch: Function returning the value of one key, or None if not found
+        key_names: Names of the keys to look up
+        max_workers: Maximum number of lookups to run at the same time
+
+    Returns:
+        Dictionary of the keys that were found to their values
+    """
+    names = list(dict.fromkeys(key_names))
+    if len(names) <= 1:
+        values = [fetch(name) for name in names]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(names))) as pool:
+            values = list(pool.map(fetch, names))
+    return {name: value for name, value in zip(names, values) if value}
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls for the same key into a single call.
+
+    While a call for a key is running, other threads asking for the same key
+    wait for it and share its result (or exception) instead of repeating the
+    work.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Call fn for key, or wait for the call already running for it.
+
+        Args:
+            key: Identifies the work being done
+            fn: Function doing the work
+
+        Returns:
+            The result of fn
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+
+        if leader:
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    del self._calls[key]
+        return future.result()
@@ -1,9 +1,25 @@
 """Core functionality for the Secret Key Manager."""
 
 import os
+import bisect
 import logging
-from typing import Dict, Optional, List, Any, Type, TypeVar, Callable
-
+import functools
+import itertools
+import threading
+from typing import (
+    Dict,
+    Optional,
+    List,
+    Tuple,
+    Any,
+    Type,
+    TypeVar,
+    Callable,
+    Iterable,
+    Sequence,
+)
+
+from secret_key_manager.cache import TTLCache
 from secret_key_manager.protocol import KeyProviderProtocol
 
 # Configure logging
@@ -12,9 +28,21 @@ logger = logging.getLogger(__name__)
 # Type for key provider classes
 T = TypeVar("T")
 
+# Writable providers paired with their validate_key methods (or None)
+_Writers = Tuple[Tuple[KeyProviderProtocol, Optional[Callable[..., bool]]], ...]
+
 # Registry to store provider classes with metadata
 _PROVIDER_REGISTRY: Dict[str, Dict[str, Any]] = {}
 
+# Index of the same registry entries keyed by provider name
+_PROVIDER_NAME_INDEX: Dict[str, Dict[str, Any]] = {}
+
+# Registry entries kept in priority order, alongside their (priority, sequence)
+# sort keys; the sequence number keeps equal priorities in registration order
+_PROVIDER_REGISTRY_SORTED: List[Dict[str, Any]] = []
+_PROVIDER_SORT_KEYS: List[Tuple[int, int]] = []
+_REGISTRATION_SEQUENCE = itertools.count()
+
 
 def KeyProvider(
     enabled: bool = True, priority: int = 100, name: Optional[str] = None
@@ -32,25 +60,48 @@ def KeyProvider(
     """
 
     def decorator(cls: Type[T]) -> Type[T]:
+        # Registering the same class again is a no-op
+        existing = _PROVIDER_REGISTRY.get(cls.__name__)
+        if existing is not None:
+            if existing["class"] is cls:
+                return cls
+            # A new class under the same name (e.g. a reloaded module) replaces it
+            for index, info in enumerate(_PROVIDER_REGISTRY_SORTED):
+                if info is existing:
+                    del _PROVIDER_REGISTRY_SORTED[index]
+                    del _PROVIDER_SORT_KEYS[index]
+                    break
+
         # Get the provider name (use custom name if provided, otherwise use class name)
         provider_name = name or cls.__name__
         if provider_name.endswith("KeyProvider"):
             provider_name = provider_name[:-11].lower()  # Remove 'KeyProvider' suffix
 
         # Store metadata in the registry
-        _PROVIDER_REGISTRY[cls.__name__] = {
+        provider_info = {
             "class": cls,
             "enabled": enabled,
             "priority": priority,
             "name": provider_name,
         }
+        _PROVIDER_REGISTRY[cls.__name__] = provider_info
+        _PROVIDER_NAME_INDEX[provider_name] = provider_info
+
+        # Insert into the priority-ordered view (lower number = higher priority)
+        sort_key = (priority, next(_REGISTRATION_SEQUENCE))
+        index = bisect.bisect_right(_PROVIDER_SORT_KEYS, sort_key)
+        _PROVIDER_SORT_KEYS.insert(index, sort_key)
+        _PROVIDER_REGISTRY_SORTED.insert(index, provider_info)
 
-        # Add name property if it doesn't exist
+        # Add a plain name attribute if the class doesn't define one
         if not hasattr(cls, "name"):
-            setattr(cls, "name", property(lambda self: provider_name))
+            cls.name = provider_name
 
         logger.debug(
-            f"Registered key provider: {cls.__name__} (enabled={enabled}, priority={priority})"
+            "Registered key provider: %s (enabled=%s, priority=%s)",
+            cls.__name__,
+            enabled,
+            priority,
         )
         return cls
 
@@ -61,12 +112,32 @@ def get_registered_providers() -> List[Dict[str, Any]]:
     """
     Get all registered provider classes from the registry.
 
+    The registry is kept sorted as providers are registered, so this returns
+    the shared list; callers must not modify it.
+
     Returns:
         List of provider metadata dictionaries, sorted by priority
     """
-    providers = list(_PROVIDER_REGISTRY.values())
-    # Sort by priority (lower number = higher priority)
-    return sorted(providers, key=lambda p: p["priority"])
+    return _PROVIDER_REGISTRY_SORTED
+
+
+def _create_provider(provider_info: Dict[str, Any]) -> Optional[KeyProviderProtocol]:
+    """
+    Instantiate a single registered provider class.
+
+    Args:
+        provider_info: Registry entry of the provider to instantiate
+
+    Returns:
+        The provider instance, or None if it failed to initialize
+    """
+    try:
+        provider_instance = provider_info["class"]()
+        logger.debug("Initialized provider: %s", provider_info["name"])
+        return provider_instance
+    except Exception as e:
+        logger.warning("Failed to initialize provider %s: %s", provider_info["name"], e)
+        return None
 
 
 def initialize_providers() -> List[KeyProviderProtocol]:
@@ -80,40 +151,84 @@ def initialize_providers() -> List[KeyProviderProtocol]:
 
     for provider_info in get_registered_providers():
         if provider_info["enabled"]:
-            try:
-                provider_class = provider_info["class"]
-                provider_instance = provider_class()
+            provider_instance = _create_provider(provider_info)
+            if provider_instance is not None:
                 provider_instances.append(provider_instance)
-                logger.debug(f"Initialized provider: {provider_info['name']}")
-            except Exception as e:
-                logger.warning(
-                    f"Failed to initialize provider {provider_info['name']}: {e}"
-                )
 
     return provider_instances
 
 
 class KeyManager:
     """
-    Singleton class for managing API keys with plugin providers.
-    """
+    Class for managing API keys with plugin providers.
 
-    _instance = None
-    _keys: Dict[str, str] = {}
-    _providers: List[KeyProviderProtocol] = []
-    _initialized: bool = False
+    Use the shared ``keys`` instance (see ``_get_manager``) rather than
+    creating new managers directly.
 
-    def __new__(cls):
-        """Ensure only one instance exists."""
-        if cls._instance is None:
-            cls._instance = super(KeyManager, cls).__new__(cls)
-        return cls._instance
+    Attributes:
+        propagate_env: Whether keys resolved by providers are also exported
+            to ``os.environ``
+    """
+
+    def __init__(self) -> None:
+        self.propagate_env = True
+        self._keys: Dict[str, str] = {}
+        # Snapshots derived from the provider list, each stored with the tuple
+        # it was built from; readers fill them without the lock, so one built
+        # from a list that has since been replaced is simply rebuilt
+        self._provider_names_cache: Optional[
+            Tuple[Tuple[KeyProviderProtocol, ...], Tuple[str, ...]]
+        ] = None
+        self._writers_cache: Optional[
+            Tuple[Tuple[KeyProviderProtocol, ...], _Writers]
+        ] = None
+        self._writable_cache: Optional[Tuple[_Writers, Tuple[str, ...]]] = None
+        # get_provider_info() results by provider name, stored with the
+        # instance they came from since they are fixed for that instance
+        self._info_cache: Dict[str, Tuple[KeyProviderProtocol, Dict[str, Any]]] = {}
+        self._providers = ()
+        # Recently failed lookups, keyed by (key_name, providers)
+        self._misses = TTLCache(maxsize=256, ttl=60)
+        # Serializes provider initialization and changes to the provider list;
+        # readers iterate whatever list is current without taking it. It is
+        # reentrant so a provider constructor may look up keys itself
+        self._lock = threading.RLock()
+        self._initialized = False
+        self._initializing = False
+
+    @property
+    def _providers(self) -> Tuple[KeyProviderProtocol, ...]:
+        """Active provider instances, ordered by priority."""
+        return self._provider_list
+
+    @_providers.setter
+    def _providers(self, providers: Iterable[KeyProviderProtocol]) -> None:
+        # The list is published as a new immutable tuple on every change, so
+        # readers can iterate it without locking; derived snapshots check
+        # which tuple they were built from
+        providers = tuple(providers)
+        # Name index for O(1) lookups by provider name, set before the list so
+        # a reader of the new list finds its providers
+        self._by_name: Dict[str, KeyProviderProtocol] = {p.name: p for p in providers}
+        self._provider_list = providers
 
     def _initialize(self) -> None:
         """Initialize all providers if not already initialized."""
-        if not self._initialized:
-            self._providers = initialize_providers()
-            self._initialized = True
+        if self._initialized:
+            return
+        with self._lock:
+            # A provider constructor that looks up a key re-enters here on the
+            # same thread; it sees the providers published so far
+            if self._initialized or self._initializing:
+                return
+            self._initializing = True
+            try:
+                self._providers = initialize_providers()
+                # Drop misses recorded by such lookups against the partial list
+                self._misses.clear()
+                self._initialized = True
+            finally:
+                self._initializing = False
 
     def register_provider(self, provider: KeyProviderProtocol) -> None:
         """
@@ -124,17 +239,19 @@ class KeyManager:
         """
         self._initialize()
 
-        # Check if provider with the same name already exists
-        for existing_provider in self._providers:
-            if existing_provider.name == provider.name:
+        with self._lock:
+            # Check if provider with the same name already exists
+            if provider.name in self._by_name:
                 logger.warning(
-                    f"A provider with name '{provider.name}' is already registered. Skipping."
+                    "A provider with name '%s' is already registered. Skipping.",
+                    provider.name,
                 )
                 return
 
-        # Add the provider
-        self._providers.append(provider)
-        logger.debug(f"Registered key provider instance: {provider.name}")
+            # Add the provider
+            self._providers = self._providers + (provider,)
+            self._misses.clear()
+        logger.debug("Registered key provider instance: %s", provider.name)
 
     def get_providers(self) -> List[str]:
         """
@@ -144,7 +261,12 @@ class KeyManager:
             List of provider names
         """
         self._initialize()
-        return [provider.name for provider in self._providers]
+        providers = self._providers
+        cached = self._provider_names_cache
+        if cached is None or cached[0] is not providers:
+            cached = (providers, tuple(provider.name for provider in providers))
+            self._provider_names_cache = cached
+        return list(cached[1])
 
     def enable_provider(self, name: str) -> bool:
         """
@@ -156,14 +278,33 @@ class KeyManager:
         Returns:
             True if successful, False if provider not found
         """
-        for provider_info in _PROVIDER_REGISTRY.values():
-            if provider_info["name"] == name:
-                provider_info["enabled"] = True
-                # Re-initialize providers
-                self._initialized = False
-                self._initialize()
-                return True
-        return False
+        provider_info = _PROVIDER_NAME_INDEX.get(name)
+        if provider_info is None:
+            return False
+
+        with self._lock:
+            provider_info["enabled"] = True
+
+            # Providers not created yet will pick up the flag on first use, and
+            # only the newly enabled provider is instantiated
+            if self._initialized and name not in self._by_name:
+                provider = _create_provider(provider_info)
+                if provider is not None:
+                    # Follow the registry's order, which breaks priority ties by
+                    # registration order; manually added providers stay last
+                    by_name = dict(self._by_name)
+                    by_name[name] = provider
+                    ordered = [
+                        by_name.pop(info["name"])
+                        for info in get_registered_providers()
+                        if info["name"] in by_name
+                    ]
+                    self._providers = ordered + [
+                        p for p in self._providers if p.name in by_name
+                    ]
+            # Cleared after publishing; see _record_miss
+            self._misses.clear()
+        return True
 
     def disable_provider(self, name: str) -> bool:
         """
@@ -175,59 +316,75 @@ class KeyManager:
         Returns:
             True if successful, False if provider not found
         """
-        for provider_info in _PROVIDER_REGISTRY.values():
-            if provider_info["name"] == name:
-                provider_info["enabled"] = False
-                # Re-initialize providers
-                self._initialized = False
-                self._initialize()
-                return True
-        return False
+        provider_info = _PROVIDER_NAME_INDEX.get(name)
+        if provider_info is None:
+            return False
+
+        with self._lock:
+            provider_info["enabled"] = False
+
+            # Providers not created yet will pick up the flag on first use;
+            # otherwise drop the instance without touching the others
+            provider = self._by_name.get(name) if self._initialized else None
+            if provider is not None:
+                providers = self._providers
+                index = providers.index(provider)
+                self._providers = providers[:index] + providers[index + 1 :]
+            # Cleared after publishing; see _record_miss
+            self._misses.clear()
+        return True
 
     def get_provider_status(self) -> Dict[str, Dict[str, Any]]:
         """
         Get the status of all registered providers.
 
         Returns:
-            Dictionary of provider names to status information
+            Dictionary of provider names to status information, ordered by priority
         """
         self._initialize()
 
+        writable = frozenset(self.get_writable_providers())
         result = {}
-        for provider_info in _PROVIDER_REGISTRY.values():
+        for provider_info in get_registered_providers():
             provider_name = provider_info["name"]
             # Find the corresponding provider instance to get capabilities
-            provider_instance = next(
-                (p for p in self._providers if p.name == provider_name), None
-            )
+            provider_instance = self._by_name.get(provider_name)
 
             status = {
                 "enabled": provider_info["enabled"],
                 "priority": provider_info["priority"],
                 "class": provider_info["class"].__name__,
-                "supports_write": False,
+                "supports_write": provider_name in writable,
                 "capabilities": {},
             }
 
             # Add capabilities information if the provider instance is available
             if provider_instance:
-                # Check for supports_write method
-                if hasattr(provider_instance, "supports_write"):
-                    status["supports_write"] = provider_instance.supports_write()
-
                 # Check for get_provider_info method
                 if hasattr(provider_instance, "get_provider_info"):
                     try:
-                        status["capabilities"] = provider_instance.get_provider_info()
+                        status["capabilities"] = dict(
+                            self._get_provider_info(provider_instance)
+                        )
                     except Exception as e:
                         logger.warning(
-                            f"Error getting provider info for '{provider_name}': {e}"
+                            "Error getting provider info for '%s': %s",
+                            provider_name,
+                            e,
                         )
 
             result[provider_name] = status
 
         return result
 
+    def _get_provider_info(self, provider: KeyProviderProtocol) -> Dict[str, Any]:
+        """Return a provider's info, calling get_provider_info only once."""
+        cached = self._info_cache.get(provider.name)
+        if cached is None or cached[0] is not provider:
+            cached = (provider, provider.get_provider_info())
+            self._info_cache[provider.name] = cached
+        return cached[1]
+
     def get_writable_providers(self) -> List[str]:
         """
         Get a list of provider names that support writing keys.
@@ -237,12 +394,26 @@ class KeyManager:
         """
         self._initialize()
 
-        writable_providers = []
-        for provider in self._providers:
-            if hasattr(provider, "supports_write") and provider.supports_write():
-                writable_providers.append(provider.name)
-
-        return writable_providers
+        writers = self._get_writers()
+        cached = self._writable_cache
+        if cached is None or cached[0] is not writers:
+            cached = (writers, tuple(provider.name for provider, _ in writers))
+            self._writable_cache = cached
+        return list(cached[1])
+
+    def _get_writers(self) -> _Writers:
+        """Return the writable providers paired with their validate_key methods."""
+        providers = self._providers
+        cached = self._writers_cache
+        if cached is None or cached[0] is not providers:
+            writers = tuple(
+                (provider, getattr(provider, "validate_key", None))
+                for provider in providers
+                if hasattr(provider, "supports_write") and provider.supports_write()
+            )
+            cached = (providers, writers)
+            self._writers_cache = cached
+        return cached[1]
 
     def get_key(
         self, key_name: str, providers: Optional[List[str]] = None
@@ -250,9 +421,14 @@ class KeyManager:
         """
         Get an API key by name. If the key doesn't exist, attempt to load it.
 
+        A key no provider has is remembered as missing for 60 seconds, or until
+        it is set in ``os.environ`` or ``invalidate`` is called; keys added to
+        other providers in the meantime are not seen until then.
+
         Args:
             key_name: The name of the key to get
-            providers: Optional list of specific provider names to use
+            providers: Optional list of specific provider names to use, tried
+                in the given order
 
         Returns:
             The API key if found, or None if not found
@@ -263,30 +439,192 @@ class KeyManager:
         if key_name in self._keys and self._keys[key_name]:
             return self._keys[key_name]
 
-        # Filter providers if specified
-        active_providers = self._providers
-        if providers:
-            active_providers = [p for p in self._providers if p.name in providers]
+        # Skip providers that recently failed to produce this key
+        miss_key = (key_name, tuple(providers) if providers else None)
+        if self._recent_miss(miss_key):
+            return None
 
         # Try each provider in order
-        for provider in active_providers:
-            try:
-                key_value = provider.get_key(key_name)
-                if key_value:
-                    # Set the key in our dictionary
-                    self._keys[key_name] = key_value
-                    # Optionally set it in the environment too for better compatibility
-                    os.environ[key_name] = key_value
-                    logger.debug(
-                        f"Retrieved key '{key_name}' from provider '{provider.name}'"
-                    )
-                    return key_value
-            except Exception as e:
-                logger.warning(f"Error in provider '{provider.name}': {e}")
+        provider_list = self._providers
+        for provider in self._select_providers(providers):
+            key_value = self._query_provider(provider, key_name)
+            if key_value:
+                self._remember(key_name, key_value, provider)
+                return key_value
 
         # If we get here, the key could not be found
+        self._record_miss(miss_key, provider_list)
+        return None
+
+    async def aget_key(
+        self, key_name: str, providers: Optional[List[str]] = None
+    ) -> Optional[str]:
+        """
+        Get an API key by name without blocking the event loop.
+
+        Unlike get_key, all selected providers are queried at the same time in
+        worker threads, so a lookup takes as long as the slowest provider rather
+        than the sum of them. The highest-priority value found is returned, but
+        every provider is asked, even when a higher-priority one has the key.
+
+        Args:
+            key_name: The name of the key to get
+            providers: Optional list of specific provider names to use, in
+                order of preference
+
+        Returns:
+            The API key if found, or None if not found
+        """
+        # Imported here since only async callers, who have loaded it already,
+        # need it; it is slow to import
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        if not self._initialized:
+            await loop.run_in_executor(None, self._initialize)
+
+        # If the key is already loaded, return it
+        if key_name in self._keys and self._keys[key_name]:
+            return self._keys[key_name]
+
+        # Skip providers that recently failed to produce this key
+        miss_key = (key_name, tuple(providers) if providers else None)
+        if self._recent_miss(miss_key):
+            return None
+
+        provider_list = self._providers
+        active_providers = self._select_providers(providers)
+        values = await asyncio.gather(
+            *(
+                loop.run_in_executor(None, self._query_provider, provider, key_name)
+                for provider in active_providers
+            )
+        )
+        for provider, key_value in zip(active_providers, values):
+            if key_value:
+                self._remember(key_name, key_value, provider)
+                return key_value
+
+        self._record_miss(miss_key, provider_list)
         return None
 
+    def _record_miss(
+        self,
+        miss_key: Tuple[str, Optional[Tuple[str, ...]]],
+        provider_list: Tuple[KeyProviderProtocol, ...],
+    ) -> None:
+        """Remember a failed lookup made against the given provider list."""
+        self._misses.set(miss_key, True)
+        # Provider changes clear the misses after publishing the new list, so
+        # a change published before this set would miss it; drop the entry
+        # rather than hide the new providers' keys
+        if self._providers is not provider_list:
+            self._misses.pop(miss_key)
+
+    def _recent_miss(self, miss_key: Tuple[str, Optional[Tuple[str, ...]]]) -> bool:
+        """Return whether a lookup recently failed and can be skipped."""
+        # A variable exported since the miss is looked up again right away
+        return miss_key in self._misses and miss_key[0] not in os.environ
+
+    @staticmethod
+    def _query_provider(provider: KeyProviderProtocol, key_name: str) -> Optional[str]:
+        """Ask one provider for a key, returning None if it has none or fails."""
+        try:
+            # Skip providers that know they don't hold the key
+            has_key = getattr(provider, "has_key", None)
+            if has_key is not None and has_key(key_name) is False:
+                return None
+            return provider.get_key(key_name) or None
+        except Exception as e:
+            logger.warning("Error in provider '%s': %s", provider.name, e)
+            return None
+
+    def get_keys(
+        self, key_names: List[str], providers: Optional[List[str]] = None
+    ) -> Dict[str, Optional[str]]:
+        """
+        Get several API keys at once.
+
+        Each provider is asked for all keys still missing in a single call, so
+        providers that support it can fetch them concurrently.
+
+        Args:
+            key_names: The names of the keys to get
+            providers: Optional list of specific provider names to use, tried
+                in the given order
+
+        Returns:
+            Dictionary of key names to values, with None for keys not found
+        """
+        self._initialize()
+
+        providers_key = tuple(providers) if providers else None
+        result: Dict[str, Optional[str]] = {}
+        pending = []
+        for key_name in dict.fromkeys(key_names):
+            result[key_name] = self._keys.get(key_name) or None
+            if result[key_name] is None and not self._recent_miss(
+                (key_name, providers_key)
+            ):
+                pending.append(key_name)
+
+        provider_list = self._providers
+        for provider in self._select_providers(providers):
+            if not pending:
+                break
+            try:
+                # Skip keys the provider knows it doesn't hold
+                has_key = getattr(provider, "has_key", None)
+                names = pending
+                if has_key is not None:
+                    names = [name for name in pending if has_key(name) is not False]
+                if not names:
+                    continue
+
+                get_keys = getattr(provider, "get_keys", None)
+                if get_keys is not None:
+                    found = get_keys(names)
+                else:
+                    found = {name: provider.get_key(name) for name in names}
+            except Exception as e:
+                logger.warning("Error in provider '%s': %s", provider.name, e)
+                continue
+
+            for key_name in names:
+                key_value = found.get(key_name)
+                if key_value:
+                    self._remember(key_name, key_value, provider)
+                    result[key_name] = key_value
+            pending = [name for name in pending if result[name] is None]
+
+        for key_name in pending:
+            self._record_miss((key_name, providers_key), provider_list)
+        return result
+
+    def _select_providers(
+        self, providers: Optional[List[str]]
+    ) -> Sequence[KeyProviderProtocol]:
+        """Return the providers to query, in the caller's order if names are given."""
+        if not providers:
+            return self._providers
+        by_name = self._by_name
+        return [by_name[name] for name in dict.fromkeys(providers) if name in by_name]
+
+    def _remember(
+        self, key_name: str, key_value: str, provider: KeyProviderProtocol
+    ) -> None:
+        """Store a key resolved by a provider."""
+        self._keys[key_name] = key_value
+        # Optionally set it in the environment too for better compatibility,
+        # skipping the putenv call when the value is already there
+        if self.propagate_env and os.environ.get(key_name) != key_value:
+            os.environ[key_name] = key_value
+        logger.debug(
+            "Retrieved key '%s' from provider '%s'",
+            key_name,
+            provider.name,
+        )
+
     def set_key(
         self,
         key_name: str,
@@ -309,6 +647,7 @@ class KeyManager:
         """
         # Always set the key in memory
         self._keys[key_name] = key_value
+        self._forget_misses(key_name)
 
         # If persistence is not requested, we're done
         if not persist:
@@ -317,24 +656,25 @@ class KeyManager:
         # Initialize providers if needed
         self._initialize()
 
-        # Filter providers if specified
-        active_providers = self._providers
+        # Only providers that support writing are considered
+        writers = self._get_writers()
         if providers:
-            active_providers = [p for p in self._providers if p.name in providers]
+            writer_by_name = {writer[0].name: writer for writer in writers}
+            writers = [
+                writer_by_name[name]
+                for name in dict.fromkeys(providers)
+                if name in writer_by_name
+            ]
 
         # Try to persist the key to each provider that supports writing
         success = False
-        for provider in active_providers:
-            # Skip providers that don't support writing
-            if not hasattr(provider, "supports_write") or not provider.supports_write():
-                continue
-
+        for provider, validate_key in writers:
             # Validate the key before writing
-            if hasattr(provider, "validate_key") and not provider.validate_key(
-                key_name, key_value
-            ):
+            if validate_key is not None and not validate_key(key_name, key_value):
                 logger.warning(
-                    f"Key '{key_name}' failed validation for provider '{provider.name}'"
+                    "Key '%s' failed validation for provider '%s'",
+                    key_name,
+                    provider.name,
                 )
                 continue
 
@@ -342,16 +682,44 @@ class KeyManager:
             try:
                 if provider.write_key(key_name, key_value):
                     logger.debug(
-                        f"Successfully wrote key '{key_name}' to provider '{provider.name}'"
+                        "Successfully wrote key '%s' to provider '%s'",
+                        key_name,
+                        provider.name,
                     )
                     success = True
             except Exception as e:
                 logger.warning(
-                    f"Error writing key '{key_name}' to provider '{provider.name}': {e}"
+                    "Error writing key '%s' to provider '%s': %s",
+                    key_name,
+                    provider.name,
+                    e,
                 )
 
         return success
 
+    def _forget_misses(self, key_name: str) -> None:
+        """Drop cached lookup failures for a key, whatever providers were used."""
+        for miss_key in self._misses.keys():
+            if miss_key[0] == key_name:
+                self._misses.pop(miss_key)
+
+    def invalidate(self, key_name: Optional[str] = None) -> None:
+        """
+        Forget cached key values and lookup failures.
+
+        The next get_key call for an invalidated key queries the providers again.
+
+        Args:
+            key_name: The key to forget, or None to clear all cached keys
+        """
+        if key_name is None:
+            self._keys.clear()
+            self._misses.clear()
+            return
+
+        self._keys.pop(key_name, None)
+        self._forget_misses(key_name)
+
     def ensure_key(self, key_name: str, providers: Optional[List[str]] = None) -> bool:
         """
         Ensure that a key is available, printing an error if not.
@@ -367,14 +735,20 @@ class KeyManager:
 
         key = self.get_key(key_name, providers)
         if not key:
-            logger.error(f"ERROR: {key_name} is not set.")
+            logger.error("ERROR: %s is not set.", key_name)
 
             # List the providers that were tried
             provider_names = self.get_providers() if providers is None else providers
-            logger.error(f"Tried providers: {', '.join(provider_names)}")
+            logger.error("Tried providers: %s", ", ".join(provider_names))
             return False
         return True
 
 
+@functools.lru_cache(maxsize=None)
+def _get_manager() -> KeyManager:
+    """Return the process-wide KeyManager instance."""
+    return KeyManager()
+
+
 # Singleton instance
-keys = KeyManager()
+keys = _get_manager()
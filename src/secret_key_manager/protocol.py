@@ -1,6 +1,6 @@
 """Protocol definitions for the Secret Key Manager."""
 
-from typing import Protocol, Optional, Dict, Any, runtime_checkable
+from typing import Protocol, Optional, Dict, Any, List, runtime_checkable
 
 
 @runtime_checkable
@@ -25,6 +25,40 @@ class KeyProviderProtocol(Protocol):
         """Get the name of this provider."""
         ...
 
+    def get_keys(self, key_names: List[str], **kwargs) -> Dict[str, str]:
+        """
+        Get several keys from this provider at once.
+
+        Providers backed by slow lookups can override this to fetch the keys
+        concurrently or in a single call.
+
+        Args:
+            key_names: The names of the keys to retrieve
+            **kwargs: Additional provider-specific arguments
+
+        Returns:
+            Dictionary of the keys that were found to their values
+        """
+        found = {}
+        for key_name in key_names:
+            key_value = self.get_key(key_name, **kwargs)
+            if key_value:
+                found[key_name] = key_value
+        return found
+
+    def has_key(self, key_name: str) -> Optional[bool]:
+        """
+        Check whether this provider holds a key without fetching it.
+
+        Args:
+            key_name: The name of the key to look for
+
+        Returns:
+            True or False if the provider knows, or None if it can't tell
+            cheaply (the key manager then calls get_key as usual)
+        """
+        return None
+
     def supports_write(self) -> bool:
         """
         Check if this provider supports writing keys.
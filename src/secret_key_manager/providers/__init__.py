@@ -1,58 +1,52 @@
 """Built-in key providers for the Secret Key Manager."""
 
+import functools
 import importlib.util
+
+# Provider modules register themselves with the KeyProvider decorator on
+# import, so they are loaded eagerly; their heavy third-party dependencies
+# are only imported once a provider needs them.
 from secret_key_manager.providers.env import EnvKeyProvider
 from secret_key_manager.providers.vault import VaultKeyProvider
 from secret_key_manager.providers.file import JsonFileKeyProvider, YamlFileKeyProvider
+from secret_key_manager.providers.dotenv import DotEnvProvider
+from secret_key_manager.providers.onepassword import OnePasswordKeyProvider
+from secret_key_manager.providers.lastpass import LastPassKeyProvider
+from secret_key_manager.providers.keyring_provider import KeyringProvider
 
-# Import DotEnv provider
-if importlib.util.find_spec("secret_key_manager.providers.dotenv"):
-    from secret_key_manager.providers.dotenv import DotEnvProvider  # noqa: F401
-
-    HAS_DOTENV = True
-else:
-    HAS_DOTENV = False
-
-# Import 1Password provider
-if importlib.util.find_spec("secret_key_manager.providers.onepassword"):
-    from secret_key_manager.providers.onepassword import OnePasswordKeyProvider  # noqa: F401
+# Flags reporting whether optional third-party packages are installed
+_OPTIONAL_DEPENDENCIES = {
+    "HAS_DOTENV": "dotenv",
+    "HAS_KEYRING": "keyring",
+}
 
-    HAS_1PASSWORD = True
-else:
-    HAS_1PASSWORD = False
+HAS_1PASSWORD = True
+HAS_LASTPASS = True
 
-# Import LastPass provider
-if importlib.util.find_spec("secret_key_manager.providers.lastpass"):
-    from secret_key_manager.providers.lastpass import LastPassKeyProvider  # noqa: F401
 
-    HAS_LASTPASS = True
-else:
-    HAS_LASTPASS = False
+@functools.lru_cache(maxsize=None)
+def _has_module(module_name: str) -> bool:
+    """Check whether a module is installed without importing it."""
+    return importlib.util.find_spec(module_name) is not None
 
-# Conditionally import keyring provider
-if importlib.util.find_spec("secret_key_manager.providers.keyring_provider"):
-    from secret_key_manager.providers.keyring_provider import KeyringProvider  # noqa: F401
 
-    HAS_KEYRING = True
-else:
-    HAS_KEYRING = False
-
-# Build __all__ based on available providers
 __all__ = [
     "EnvKeyProvider",
     "VaultKeyProvider",
     "JsonFileKeyProvider",
     "YamlFileKeyProvider",
+    "DotEnvProvider",
+    "OnePasswordKeyProvider",
+    "LastPassKeyProvider",
+    "KeyringProvider",
 ]
 
-if HAS_DOTENV:
-    __all__.append("DotEnvProvider")
-
-if HAS_1PASSWORD:
-    __all__.append("OnePasswordKeyProvider")
-
-if HAS_LASTPASS:
-    __all__.append("LastPassKeyProvider")
 
-if HAS_KEYRING:
-    __all__.append("KeyringProvider")
+def __getattr__(name: str) -> bool:
+    """Resolve the HAS_* optional-dependency flags on first access."""
+    module_name = _OPTIONAL_DEPENDENCIES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = _has_module(module_name)
+    globals()[name] = value
+    return value
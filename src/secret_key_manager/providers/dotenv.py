@@ -3,31 +3,30 @@
 import os
 import logging
 import pathlib
+import importlib.util
 from typing import Optional, Dict, Any
 
-try:
-    import dotenv
-
-    HAS_DOTENV = True
-except ImportError:
-    HAS_DOTENV = False
-
 from secret_key_manager.core import KeyProvider
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# python-dotenv is only imported once the provider actually needs it
+HAS_DOTENV = importlib.util.find_spec("dotenv") is not None
+
 
 @KeyProvider(priority=25, name="dotenv")
 class DotEnvProvider:
     """Key provider that retrieves and writes keys to a .env file."""
 
-    def __init__(self, file_path: str = ".env"):
+    def __init__(self, file_path: str = ".env", load_into_environ: bool = True):
         """
         Initialize the .env file provider.
 
         Args:
             file_path: Path to the .env file (default: .env in the current directory)
+            load_into_environ: Whether to also export the file's values to
+                os.environ (variables that are already set are kept)
         """
         if not HAS_DOTENV:
             logger.warning(
@@ -36,25 +35,39 @@ class DotEnvProvider:
             raise ImportError("python-dotenv is required for DotEnvProvider")
 
         self.file_path = os.path.abspath(os.path.expanduser(file_path))
-        self._env_values = {}
+        self.load_into_environ = load_into_environ
+        self._env_values: Dict[str, str] = {}
+        # Set once the .env file's directory is known to exist
+        self._dir_ensured = False
+        # Modification time of the .env file when it was last loaded
+        self._mtime_ns: Optional[int] = None
         self._load_dotenv()
 
+    def _current_mtime(self) -> Optional[int]:
+        """Return the .env file's modification time, or None if it is missing."""
+        try:
+            return os.stat(self.file_path).st_mtime_ns
+        except OSError:
+            return None
+
     def _load_dotenv(self) -> None:
         """Load key-value pairs from the .env file."""
-        if os.path.exists(self.file_path):
+        self._mtime_ns = self._current_mtime()
+        if self._mtime_ns is not None:
             try:
-                # Load the .env file
-                result = dotenv.load_dotenv(self.file_path)
-                if result:
-                    # Get all environment variables
-                    self._env_values = dict(os.environ)
-                    logger.debug(f"Loaded environment variables from {self.file_path}")
-                else:
-                    logger.warning(f"Failed to load .env file from {self.file_path}")
+                import dotenv
+
+                # Read only the file's own values; keys without a value are skipped
+                values = dotenv.dotenv_values(self.file_path) or {}
+                self._env_values = {k: v for k, v in values.items() if v is not None}
+                if self.load_into_environ:
+                    for key_name, key_value in self._env_values.items():
+                        os.environ.setdefault(key_name, key_value)
+                logger.debug("Loaded environment variables from %s", self.file_path)
             except Exception as e:
-                logger.error(f"Error loading .env file: {e}")
+                logger.error("Error loading .env file: %s", e)
         else:
-            logger.debug(f".env file not found at {self.file_path}")
+            logger.debug(".env file not found at %s", self.file_path)
 
     def get_key(self, key_name: str, **kwargs) -> Optional[str]:
         """
@@ -72,18 +85,27 @@ class DotEnvProvider:
             file_path = os.path.abspath(os.path.expanduser(kwargs["file_path"]))
             # Load from the specified file
             try:
+                import dotenv
+
                 values = dotenv.dotenv_values(file_path)
                 return values.get(key_name)
             except Exception as e:
-                logger.error(f"Error loading .env file {file_path}: {e}")
+                logger.error("Error loading .env file %s: %s", file_path, e)
                 return None
 
-        # Reload the .env file to get the latest values
-        self._load_dotenv()
+        # Reload the .env file only if it changed since it was last loaded
+        if self._current_mtime() != self._mtime_ns:
+            self._load_dotenv()
 
         # Return the value from environment
         return self._env_values.get(key_name)
 
+    def has_key(self, key_name: str) -> bool:
+        """Check whether the loaded .env values contain a key."""
+        if self._current_mtime() != self._mtime_ns:
+            self._load_dotenv()
+        return key_name in self._env_values
+
     def supports_write(self) -> bool:
         """Check if this provider supports writing keys."""
         return True
@@ -106,25 +128,32 @@ class DotEnvProvider:
         )
 
         try:
-            # Create directory if it doesn't exist
-            directory = os.path.dirname(file_path)
-            if directory and not os.path.exists(directory):
-                pathlib.Path(directory).mkdir(parents=True, exist_ok=True)
+            import dotenv
+
+            # Create directory if it doesn't exist (once for the provider's own file)
+            own_file = file_path == self.file_path
+            if not (own_file and self._dir_ensured):
+                directory = os.path.dirname(file_path)
+                if directory:
+                    pathlib.Path(directory).mkdir(parents=True, exist_ok=True)
+                self._dir_ensured = self._dir_ensured or own_file
 
             # Use dotenv.set_key to update the .env file
             dotenv.set_key(file_path, key_name, key_value, quote_mode="always")
 
-            # Update the cached values
-            self._load_dotenv()
+            # Update the cached values in place instead of re-reading the file
+            if own_file:
+                self._env_values[key_name] = key_value
+                self._mtime_ns = self._current_mtime()
 
             logger.debug(
-                f"Successfully wrote key '{key_name}' to .env file {file_path}"
+                "Successfully wrote key '%s' to .env file %s", key_name, file_path
             )
             return True
 
         except Exception as e:
             logger.error(
-                f"Error writing key '{key_name}' to .env file {file_path}: {e}"
+                "Error writing key '%s' to .env file %s: %s", key_name, file_path, e
             )
             return False
 
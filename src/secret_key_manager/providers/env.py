@@ -10,6 +10,11 @@ from secret_key_manager.core import KeyProvider
 class EnvKeyProvider:
     """Key provider that retrieves keys from environment variables."""
 
+    def __init__(self):
+        """Initialize the environment variable provider."""
+        # Bound once; this provider is asked first for every key
+        self._env_get = os.environ.get
+
     def get_key(self, key_name: str, **kwargs) -> Optional[str]:
         """
         Get a key from environment variables.
@@ -21,7 +26,4 @@ class EnvKeyProvider:
         Returns:
             The key value if found in environment, or None if not found
         """
-        key_value = os.getenv(key_name)
-        if key_value and len(key_value) > 0:
-            return key_value
-        return None
+        return self._env_get(key_name) or None
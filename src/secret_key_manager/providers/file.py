@@ -2,57 +2,138 @@
 
 import os
 import json
-import yaml
+import stat
 import logging
+import functools
 import pathlib
+import tempfile
 from typing import Optional, Dict, Any
 
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 from secret_key_manager.core import KeyProvider
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=16)
+def _expand(path: str) -> str:
+    """Expand '~' in a path, caching the result."""
+    return os.path.expanduser(path)
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize to indented JSON bytes, using orjson when it is installed."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def _ensure_parent_dir(path: str) -> None:
+    """Create the directory containing path if it doesn't exist."""
+    directory = os.path.dirname(path)
+    if directory:
+        pathlib.Path(directory).mkdir(parents=True, exist_ok=True)
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """
+    Write data to path without ever leaving a partially written file behind.
+
+    The data goes to a private (0600) temporary file next to the target, which
+    then replaces it in one step. An existing file's permission bits are
+    applied before any data is written, and a symlinked path keeps its link:
+    the file it points to is replaced instead.
+    """
+    real_path = os.path.realpath(path)
+    try:
+        mode: Optional[int] = stat.S_IMODE(os.stat(real_path).st_mode)
+    except FileNotFoundError:
+        mode = None
+
+    directory, name = os.path.split(real_path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            # By path, since os.fchmod is missing on Windows before 3.13
+            if mode is not None:
+                os.chmod(tmp_path, mode)
+            f.write(data)
+        os.replace(tmp_path, real_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 @KeyProvider(priority=30, name="json_file")
 class JsonFileKeyProvider:
     """Key provider that retrieves keys from a JSON file."""
 
+    __slots__ = ("file_path", "_keys", "_dir_ensured")
+
     def __init__(self, file_path: str = "~/.config/secret_key_manager/keys.json"):
-        self.file_path = os.path.expanduser(file_path)
-        self._keys: Dict[str, str] = {}
-        self._load_keys()
+        self.file_path = _expand(file_path)
+        # Loaded on first use
+        self._keys: Optional[Dict[str, str]] = None
+        # Set once the parent directory is known to exist
+        self._dir_ensured = False
 
     def _load_keys(self) -> None:
         """Load keys from the file."""
         if os.path.exists(self.file_path):
             try:
-                with open(self.file_path, "r") as f:
-                    self._keys = json.load(f)
-                logger.debug(f"Loaded keys from JSON file: {self.file_path}")
+                with open(self.file_path, "rb") as f:
+                    self._keys = _json_loads(f.read())
+                logger.debug("Loaded keys from JSON file: %s", self.file_path)
             except Exception as e:
-                logger.error(f"Error loading keys from JSON file: {e}")
+                logger.error("Error loading keys from JSON file: %s", e)
         else:
-            logger.debug(f"JSON keys file not found: {self.file_path}")
+            logger.debug("JSON keys file not found: %s", self.file_path)
 
     def _save_keys(self) -> bool:
         """Save keys to the file."""
         try:
-            # Create directory if it doesn't exist
-            directory = os.path.dirname(self.file_path)
-            if directory and not os.path.exists(directory):
-                pathlib.Path(directory).mkdir(parents=True, exist_ok=True)
-
-            with open(self.file_path, "w") as f:
-                json.dump(self._keys, f, indent=2)
-            logger.debug(f"Saved keys to JSON file: {self.file_path}")
+            if not self._dir_ensured:
+                _ensure_parent_dir(self.file_path)
+                self._dir_ensured = True
+
+            _atomic_write(self.file_path, _json_dumps(self._keys))
+            logger.debug("Saved keys to JSON file: %s", self.file_path)
             return True
         except Exception as e:
-            logger.error(f"Error saving keys to JSON file: {e}")
+            logger.error("Error saving keys to JSON file: %s", e)
             return False
 
+    def _get_keys(self) -> Dict[str, str]:
+        """Return the loaded keys, reading the file on first access."""
+        if self._keys is None:
+            self._load_keys()
+            self._keys = self._keys or {}
+        return self._keys
+
     def get_key(self, key_name: str, **kwargs) -> Optional[str]:
         """Get a key from the loaded JSON file data."""
-        return self._keys.get(key_name)
+        return self._get_keys().get(key_name)
+
+    def has_key(self, key_name: str) -> bool:
+        """Check whether the JSON file data contains a key."""
+        return key_name in self._get_keys()
 
     def supports_write(self) -> bool:
         """Check if this provider supports writing keys."""
@@ -60,7 +141,7 @@ class JsonFileKeyProvider:
 
     def write_key(self, key_name: str, key_value: str, **kwargs) -> bool:
         """Write a key to the JSON file."""
-        self._keys[key_name] = key_value
+        self._get_keys()[key_name] = key_value
         return self._save_keys()
 
     def get_provider_info(self) -> Dict[str, Any]:
@@ -76,42 +157,65 @@ class JsonFileKeyProvider:
 class YamlFileKeyProvider:
     """Key provider that retrieves keys from a YAML file."""
 
+    __slots__ = ("file_path", "_keys", "_dir_ensured")
+
     def __init__(self, file_path: str = "~/.config/secret_key_manager/keys.yaml"):
-        self.file_path = os.path.expanduser(file_path)
-        self._keys: Dict[str, str] = {}
-        self._load_keys()
+        self.file_path = _expand(file_path)
+        # Loaded on first use
+        self._keys: Optional[Dict[str, str]] = None
+        # Set once the parent directory is known to exist
+        self._dir_ensured = False
 
     def _load_keys(self) -> None:
         """Load keys from the file."""
         if os.path.exists(self.file_path):
             try:
+                # Imported lazily so PyYAML is only loaded when a YAML file exists
+                import yaml
+
+                # Prefer the libyaml-backed loader when PyYAML was built with it
+                loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
                 with open(self.file_path, "r") as f:
-                    self._keys = yaml.safe_load(f)
-                logger.debug(f"Loaded keys from YAML file: {self.file_path}")
+                    # An empty file loads as None
+                    self._keys = yaml.load(f, Loader=loader) or {}
+                logger.debug("Loaded keys from YAML file: %s", self.file_path)
             except Exception as e:
-                logger.error(f"Error loading keys from YAML file: {e}")
+                logger.error("Error loading keys from YAML file: %s", e)
         else:
-            logger.debug(f"YAML keys file not found: {self.file_path}")
+            logger.debug("YAML keys file not found: %s", self.file_path)
 
     def _save_keys(self) -> bool:
         """Save keys to the file."""
         try:
-            # Create directory if it doesn't exist
-            directory = os.path.dirname(self.file_path)
-            if directory and not os.path.exists(directory):
-                pathlib.Path(directory).mkdir(parents=True, exist_ok=True)
-
-            with open(self.file_path, "w") as f:
-                yaml.dump(self._keys, f, default_flow_style=False)
-            logger.debug(f"Saved keys to YAML file: {self.file_path}")
+            import yaml
+
+            if not self._dir_ensured:
+                _ensure_parent_dir(self.file_path)
+                self._dir_ensured = True
+
+            dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+            data = yaml.dump(self._keys, Dumper=dumper, default_flow_style=False)
+            _atomic_write(self.file_path, data.encode("utf-8"))
+            logger.debug("Saved keys to YAML file: %s", self.file_path)
             return True
         except Exception as e:
-            logger.error(f"Error saving keys to YAML file: {e}")
+            logger.error("Error saving keys to YAML file: %s", e)
             return False
 
+    def _get_keys(self) -> Dict[str, str]:
+        """Return the loaded keys, reading the file on first access."""
+        if self._keys is None:
+            self._load_keys()
+            self._keys = self._keys or {}
+        return self._keys
+
     def get_key(self, key_name: str, **kwargs) -> Optional[str]:
         """Get a key from the loaded YAML file data."""
-        return self._keys.get(key_name)
+        return self._get_keys().get(key_name)
+
+    def has_key(self, key_name: str) -> bool:
+        """Check whether the YAML file data contains a key."""
+        return key_name in self._get_keys()
 
     def supports_write(self) -> bool:
         """Check if this provider supports writing keys."""
@@ -119,7 +223,7 @@ class YamlFileKeyProvider:
 
     def write_key(self, key_name: str, key_value: str, **kwargs) -> bool:
         """Write a key to the YAML file."""
-        self._keys[key_name] = key_value
+        self._get_keys()[key_name] = key_value
         return self._save_keys()
 
     def get_provider_info(self) -> Dict[str, Any]:
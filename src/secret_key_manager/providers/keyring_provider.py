@@ -1,27 +1,54 @@
 """Keyring-based key provider."""
 
 import logging
-import keyring
-from typing import Optional, Dict, Any
+import importlib.util
+from types import MappingProxyType
+from typing import Optional, Any, Mapping, Tuple
 
+from secret_key_manager.cache import TTLCache
+from secret_key_manager.concurrency import SingleFlight
 from secret_key_manager.core import KeyProvider
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# keyring is slow to import (it loads the platform backends), so it is only
+# imported once the provider talks to the keyring
+HAS_KEYRING = importlib.util.find_spec("keyring") is not None
+
 
 @KeyProvider(priority=50, name="keyring")
 class KeyringProvider:
     """Key provider that retrieves keys from the system keyring."""
 
-    def __init__(self, service_name: str = "secret_key_manager"):
+    __slots__ = ("service_name", "_info", "_cache", "_inflight")
+
+    # Writing is always supported by the keyring API
+    _SUPPORTS_WRITE = True
+
+    def __init__(
+        self, service_name: str = "secret_key_manager", cache_ttl: float = 60.0
+    ):
         """
         Initialize the keyring provider.
 
         Args:
             service_name: The service name to use for keyring lookups
+            cache_ttl: Number of seconds a retrieved key is reused before the
+                keyring is asked again
         """
+        if not HAS_KEYRING:
+            logger.warning(
+                "keyring package is not installed. Keyring provider will not work."
+            )
+            raise ImportError("keyring is required for KeyringProvider")
+
         self.service_name = service_name
+        # Retrieved keys, by (service_name, key_name)
+        self._cache = TTLCache(maxsize=256, ttl=cache_ttl)
+        self._inflight = SingleFlight()
+        # Provider info, built on first use since it needs the keyring backend
+        self._info: Optional[Mapping[str, Any]] = None
 
     def get_key(self, key_name: str, **kwargs) -> Optional[str]:
         """
@@ -38,21 +65,34 @@ class KeyringProvider:
         # Get the service name
         service_name = kwargs.get("service_name", self.service_name)
 
+        cache_key = (service_name, key_name)
+        key_value = self._cache.get(cache_key)
+        if key_value is None:
+            # Concurrent lookups of the same key share a single keyring call
+            key_value = self._inflight.do(cache_key, lambda: self._fetch_key(cache_key))
+        return key_value
+
+    def _fetch_key(self, cache_key: Tuple[str, str]) -> Optional[str]:
+        """Get a (service_name, key_name) pair from the keyring and cache it."""
+        import keyring
+
+        service_name, key_name = cache_key
         try:
             # Get the key from the keyring
             key_value = keyring.get_password(service_name, key_name)
 
             # Return key if found
             if key_value is not None:
+                self._cache.set(cache_key, key_value)
                 return key_value
         except Exception as e:
-            logger.warning(f"Error retrieving key '{key_name}' from keyring: {e}")
+            logger.warning("Error retrieving key '%s' from keyring: %s", key_name, e)
 
         return None
 
     def supports_write(self) -> bool:
         """Check if this provider supports writing keys."""
-        return True
+        return self._SUPPORTS_WRITE
 
     def write_key(self, key_name: str, key_value: str, **kwargs) -> bool:
         """
@@ -67,25 +107,37 @@ class KeyringProvider:
         Returns:
             True if the key was successfully written, False otherwise
         """
+        import keyring
+
         # Get the service name
         service_name = kwargs.get("service_name", self.service_name)
 
         try:
             # Write the key to the keyring
             keyring.set_password(service_name, key_name, key_value)
+            self._cache.set((service_name, key_name), key_value)
             logger.debug(
-                f"Successfully wrote key '{key_name}' to keyring service '{service_name}'"
+                "Successfully wrote key '%s' to keyring service '%s'",
+                key_name,
+                service_name,
             )
             return True
         except Exception as e:
-            logger.error(f"Error writing key '{key_name}' to keyring: {e}")
+            logger.error("Error writing key '%s' to keyring: %s", key_name, e)
             return False
 
-    def get_provider_info(self) -> Dict[str, Any]:
-        """Get information about this provider."""
-        return {
-            "name": self.name,
-            "supports_write": self.supports_write(),
-            "service_name": self.service_name,
-            "backend": str(keyring.get_keyring().__class__.__name__),
-        }
+    def get_provider_info(self) -> Mapping[str, Any]:
+        """Get information about this provider (read-only, built once)."""
+        if self._info is None:
+            import keyring
+
+            # Backend discovery can probe system services, so only do it once
+            self._info = MappingProxyType(
+                {
+                    "name": self.name,
+                    "supports_write": self._SUPPORTS_WRITE,
+                    "service_name": self.service_name,
+                    "backend": type(keyring.get_keyring()).__name__,
+                }
+            )
+        return self._info
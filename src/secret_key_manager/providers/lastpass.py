@@ -2,27 +2,39 @@
 
 import subprocess
 import logging
-from typing import Optional
+import shutil
+from typing import Optional, Dict, List
 
+from secret_key_manager.cache import TTLCache
+from secret_key_manager.concurrency import SingleFlight, fetch_concurrently
 from secret_key_manager.core import KeyProvider
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Location of the LastPass CLI, looked up once instead of running it to check
+_OLP_PATH = shutil.which("olp")
+
 
 @KeyProvider(priority=40, name="lastpass")
 class LastPassKeyProvider:
     """Key provider that retrieves keys from LastPass CLI."""
 
-    def __init__(self):
-        """Initialize the LastPass CLI provider."""
+    def __init__(self, cache_ttl: float = 60.0):
+        """
+        Initialize the LastPass CLI provider.
+
+        Args:
+            cache_ttl: Number of seconds a retrieved key is reused before the
+                LastPass CLI is asked again
+        """
         self._check_olp_installed()
+        self._cache = TTLCache(maxsize=256, ttl=cache_ttl)
+        self._inflight = SingleFlight()
 
     def _check_olp_installed(self) -> None:
         """Check if the LastPass CLI is installed and accessible."""
-        try:
-            subprocess.run(["olp", "--help"], capture_output=True, text=True)
-        except (subprocess.SubprocessError, FileNotFoundError):
+        if _OLP_PATH is None:
             logger.error(
                 "LastPass CLI not found. Please make sure it's installed and available in your PATH."
             )
@@ -39,14 +51,29 @@ class LastPassKeyProvider:
         Returns:
             The key value if successfully retrieved from LastPass, or None if not found
         """
+        key_value = self._cache.get(key_name)
+        if key_value is None:
+            # Concurrent lookups of the same key share a single olp call
+            key_value = self._inflight.do(key_name, lambda: self._fetch_key(key_name))
+        return key_value
+
+    def _fetch_key(self, key_name: str) -> Optional[str]:
+        """Run the LastPass CLI for a key and cache the value it prints."""
+        key_value = None
         try:
-            result = subprocess.run(["olp", key_name], capture_output=True, text=True)
+            result = subprocess.run(["olp", key_name], capture_output=True)
 
-            if result.returncode == 0 and result.stdout:
-                key_value = result.stdout.strip()
-                if key_value:
-                    return key_value
+            if result.returncode == 0:
+                key_value = result.stdout.strip().decode("utf-8", "replace") or None
         except subprocess.SubprocessError as e:
-            logger.debug(f"Failed to get {key_name} from LastPass: {e}")
+            logger.debug("Failed to get %s from LastPass: %s", key_name, e)
+
+        if key_value is not None:
+            self._cache.set(key_name, key_value)
+        return key_value
 
-        return None
+    def get_keys(self, key_names: List[str], **kwargs) -> Dict[str, str]:
+        """Get several keys from LastPass, running the lookups concurrently."""
+        return fetch_concurrently(
+            lambda key_name: self.get_key(key_name, **kwargs), key_names
+        )
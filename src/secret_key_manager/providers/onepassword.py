@@ -3,67 +3,288 @@
 import subprocess
 import logging
 import os
+import shutil
+import functools
+import re
+import sys
 import json
+import importlib.util
 from pathlib import Path
-from typing import Optional, Dict, Any
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Mapping, Tuple
 
+from secret_key_manager import __version__
+from secret_key_manager.cache import TTLCache
+from secret_key_manager.concurrency import SingleFlight
 from secret_key_manager.core import KeyProvider
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Location of the 1Password CLI, looked up once instead of running it to check
+_OP_PATH = shutil.which("op")
+
+# The 1Password SDK (onepassword-sdk) resolves secrets in-process when a
+# service account token is configured; it is only imported when used
+HAS_ONEPASSWORD_SDK = importlib.util.find_spec("onepassword") is not None
+
 # Default config values
 DEFAULT_CONFIG = {"account": "my.1password.com", "env_file": "~/.local/.env"}
 
+# Matches the session variable printed by `op signin`, e.g. export OP_SESSION_my="..."
+_SESSION_PATTERN = re.compile(r"\b(OP_SESSION_\w+)=[\"']?([^\"'\s]+)")
+
+# Prints the environment as a JSON object, which unlike `env` output keeps
+# multi-line values intact
+_DUMP_ENV_SCRIPT = "import json, os; print(json.dumps(dict(os.environ)))"
+
+
+@functools.lru_cache(maxsize=8)
+def _read_config(path: str, mtime_ns: int) -> Mapping[str, Any]:
+    """
+    Parse the config file at path, as of its modification time mtime_ns.
+
+    A mtime_ns of 0 means there is no config file and the defaults are used.
+    The result is read-only because it is shared by all provider instances.
+    """
+    config = DEFAULT_CONFIG.copy()
+
+    if mtime_ns:
+        try:
+            with open(path, "r") as f:
+                file_config = json.load(f)
+                config.update(file_config)
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning("Failed to load 1Password config: %s", e)
+
+    return MappingProxyType(config)
+
+
+def _load_config() -> Mapping[str, Any]:
+    """
+    Load configuration from config file or use defaults.
+
+    The file is only parsed again when its modification time changes.
+    """
+    config_dir = Path(os.path.expanduser("~/.local/secret-key-manager"))
+    config_file = config_dir / ".config"
+
+    try:
+        mtime_ns = config_file.stat().st_mtime_ns
+    except FileNotFoundError:
+        mtime_ns = 0
+        # Create default config file, unless another process just did
+        try:
+            os.makedirs(config_dir, exist_ok=True)
+            with open(config_file, "x") as f:
+                json.dump(DEFAULT_CONFIG, f, indent=2)
+        except FileExistsError:
+            pass
+        except IOError as e:
+            logger.warning("Failed to create default 1Password config: %s", e)
+
+    return _read_config(str(config_file), mtime_ns)
+
+
+def _read_env_file(path: str) -> Dict[str, str]:
+    """Read the KEY=VALUE lines of an env file, as `op run --env-file` does."""
+    values = {}
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            if line.startswith("export "):
+                line = line[len("export ") :]
+            key, _, value = line.partition("=")
+            value = value.strip()
+            if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+                value = value[1:-1]
+            values[key.strip()] = value
+    return values
+
+
+async def _sdk_resolve(token: str, references: Dict[str, str]) -> Dict[str, str]:
+    """Resolve op:// secret references with the 1Password SDK."""
+    import asyncio
+
+    from onepassword.client import Client
+
+    client = await Client.authenticate(
+        auth=token,
+        integration_name="secret-key-manager",
+        integration_version=__version__,
+    )
+    values = await asyncio.gather(
+        *(client.secrets.resolve(reference) for reference in references.values())
+    )
+    return dict(zip(references, values))
+
+
+def _service_account_token() -> Optional[str]:
+    """Return the configured 1Password service account token, if any."""
+    return os.environ.get("OP_SERVICE_ACCOUNT_TOKEN") or _load_config().get(
+        "service_account_token"
+    )
+
 
 @KeyProvider(priority=30, name="1password")
 class OnePasswordKeyProvider:
     """Key provider that retrieves keys from the 1Password CLI (op)."""
 
-    def __init__(self):
-        """Initialize the 1Password CLI provider."""
-        self.config = self._load_config()
+    def __init__(self, cache_ttl: float = 300.0):
+        """
+        Initialize the 1Password CLI provider.
+
+        Args:
+            cache_ttl: Number of seconds secrets fetched from 1Password are reused
+        """
         self._check_op_installed()
+        self.config = _load_config()
+        # Session variables from `op signin`, per account
+        self._sessions: Dict[str, Dict[str, str]] = {}
+        # Environments resolved by `op run`, per (account, env_file)
+        self._env_cache = TTLCache(maxsize=8, ttl=cache_ttl)
+        self._inflight = SingleFlight()
 
     def _check_op_installed(self) -> None:
         """Check if the 1Password CLI is installed and accessible."""
-        try:
-            subprocess.run(
-                ["op", "--version"], capture_output=True, text=True, check=True
-            )
-        except (subprocess.SubprocessError, FileNotFoundError):
+        if _OP_PATH is None and not (HAS_ONEPASSWORD_SDK and _service_account_token()):
             logger.error(
                 "1Password CLI not found. Please install it from: "
                 "https://1password.com/downloads/command-line/"
             )
             raise RuntimeError("1Password CLI (op) not installed")
 
-    def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from config file or use defaults."""
-        config_dir = Path(os.path.expanduser("~/.local/secret-key-manager"))
-        config_file = config_dir / ".config"
+    def _signin(self, account: str) -> Dict[str, str]:
+        """
+        Sign in to a 1Password account and remember its session.
 
-        if not config_dir.exists():
-            os.makedirs(config_dir, exist_ok=True)
+        Returns:
+            The session environment variables to pass to later `op` calls; empty
+            when the CLI doesn't hand out a token (e.g. desktop app integration)
+        """
+        result = subprocess.run(
+            ["op", "signin", "--account", account],
+            capture_output=True,
+            check=True,
+        )
+        session = dict(
+            _SESSION_PATTERN.findall(result.stdout.decode("utf-8", "replace"))
+        )
+        self._sessions[account] = session
+        return session
+
+    def _op_run(
+        self, account: str, env_file: str, *args: str
+    ) -> subprocess.CompletedProcess:
+        """
+        Run a command under `op run` with the secrets from env_file loaded.
 
-        config = DEFAULT_CONFIG.copy()
+        Signs in on first use and once more if the session has expired.
 
-        if config_file.exists():
-            try:
-                with open(config_file, "r") as f:
-                    file_config = json.load(f)
-                    config.update(file_config)
-            except (json.JSONDecodeError, IOError) as e:
-                logger.warning(f"Failed to load 1Password config: {e}")
-        else:
-            # Create default config file
+        Returns:
+            The completed process
+        """
+        command = ["op", "run", f"--env-file={env_file}", "--no-masking", "--", *args]
+
+        # Sign in only once per account and reuse the session afterwards
+        session = self._sessions.get(account)
+        if session is None:
+            session = self._signin(account)
+
+        result = subprocess.run(
+            command,
+            capture_output=True,
+            env={**os.environ, **session},
+        )
+
+        # The session may have expired; sign in again and retry once
+        if result.returncode != 0 and b"signed in" in (result.stderr or b""):
+            session = self._signin(account)
+            result = subprocess.run(
+                command,
+                capture_output=True,
+                env={**os.environ, **session},
+            )
+        return result
+
+    def _resolve_target(self, kwargs: Dict[str, Any]) -> Tuple[str, str]:
+        """Return the account and env file to use, honoring per-call overrides."""
+        account = kwargs.get("account", self.config.get("account"))
+        env_file = os.path.expanduser(
+            kwargs.get("env_file", self.config.get("env_file"))
+        )
+        return account, env_file
+
+    def _get_env(self, account: str, env_file: str) -> Dict[str, str]:
+        """
+        Return the environment `op run` resolves from env_file.
+
+        The whole environment is fetched with one `op run` call, or with the
+        1Password SDK when a service account token is configured, and cached so
+        secrets are only decrypted again once the cache entry expires.
+        """
+        cache_key = (account, env_file)
+        env = self._env_cache.get(cache_key)
+        if env is None:
+            # Concurrent lookups share a single `op run` (or SDK) call
+            env = self._inflight.do(
+                cache_key, lambda: self._load_env(account, env_file)
+            )
+        return env
+
+    def _load_env(self, account: str, env_file: str) -> Dict[str, str]:
+        """Fetch the environment for _get_env and cache it."""
+        cache_key = (account, env_file)
+        token = _service_account_token() if HAS_ONEPASSWORD_SDK else None
+        if token:
             try:
-                with open(config_file, "w") as f:
-                    json.dump(DEFAULT_CONFIG, f, indent=2)
-            except IOError as e:
-                logger.warning(f"Failed to create default 1Password config: {e}")
+                env = self._resolve_with_sdk(env_file, token)
+                self._env_cache.set(cache_key, env)
+                return env
+            except Exception as e:
+                if _OP_PATH is None:
+                    logger.debug("Failed to load secrets with the 1Password SDK: %s", e)
+                    return {}
+                logger.debug("1Password SDK lookup failed, using the CLI: %s", e)
 
-        return config
+        result = self._op_run(account, env_file, sys.executable, "-c", _DUMP_ENV_SCRIPT)
+        if result.returncode != 0 or not result.stdout:
+            logger.debug(
+                "Failed to load secrets from 1Password: %s",
+                (result.stderr or b"").decode("utf-8", "replace").strip(),
+            )
+            return {}
+
+        env = json.loads(result.stdout)
+        self._env_cache.set(cache_key, env)
+        return env
+
+    @staticmethod
+    def _resolve_with_sdk(env_file: str, token: str) -> Dict[str, str]:
+        """
+        Resolve env_file with the 1Password SDK instead of `op run`.
+
+        Returns:
+            The environment `op run` would give its command
+        """
+        import asyncio
+
+        values = _read_env_file(env_file)
+        references = {
+            key_name: value
+            for key_name, value in values.items()
+            if value.startswith("op://")
+        }
+        # Runs in the calling thread; fails (and falls back to the CLI) when
+        # called from inside a running event loop
+        resolved = asyncio.run(_sdk_resolve(token, references))
+        return {**os.environ, **values, **resolved}
+
+    def refresh(self) -> None:
+        """Forget the cached secrets so the next lookup asks 1Password again."""
+        self._env_cache.clear()
 
     def get_key(self, key_name: str, **kwargs) -> Optional[str]:
         """
@@ -76,40 +297,30 @@ class OnePasswordKeyProvider:
         Returns:
             The key value if successfully retrieved from 1Password, or None if not found
         """
-        account = kwargs.get("account", self.config.get("account"))
-        env_file = os.path.expanduser(
-            kwargs.get("env_file", self.config.get("env_file"))
-        )
+        return self.get_keys([key_name], **kwargs).get(key_name)
 
-        try:
-            # First sign in to 1Password
-            subprocess.run(
-                ["op", "signin", "--account", account],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
+    def get_keys(self, key_names: List[str], **kwargs) -> Dict[str, str]:
+        """
+        Get several keys from the 1Password CLI.
 
-            # Then retrieve the key
-            result = subprocess.run(
-                [
-                    "op",
-                    "run",
-                    f"--env-file={env_file}",
-                    "--no-masking",
-                    "--",
-                    "printenv",
-                    key_name,
-                ],
-                capture_output=True,
-                text=True,
-            )
+        Args:
+            key_names: Names of the keys to retrieve
+            **kwargs: Additional provider-specific arguments
 
-            if result.returncode == 0 and result.stdout:
-                key_value = result.stdout.strip()
-                if key_value:
-                    return key_value
-        except subprocess.SubprocessError as e:
-            logger.debug(f"Failed to get {key_name} from 1Password: {e}")
+        Returns:
+            Dictionary of the keys that were found to their values
+        """
+        account, env_file = self._resolve_target(kwargs)
+
+        try:
+            env = self._get_env(account, env_file)
+        except (subprocess.SubprocessError, ValueError) as e:
+            logger.debug("Failed to get %s from 1Password: %s", ", ".join(key_names), e)
+            return {}
 
-        return None
+        found = {}
+        for key_name in key_names:
+            key_value = (env.get(key_name) or "").strip()
+            if key_value:
+                found[key_name] = key_value
+        return found
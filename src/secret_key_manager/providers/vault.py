@@ -2,8 +2,10 @@
 
 import subprocess
 import logging
-from typing import Optional
+from typing import Optional, Dict, List
 
+from secret_key_manager.cache import TTLCache
+from secret_key_manager.concurrency import SingleFlight, fetch_concurrently
 from secret_key_manager.core import KeyProvider
 
 # Configure logging
@@ -14,6 +16,17 @@ logger = logging.getLogger(__name__)
 class VaultKeyProvider:
     """Key provider that retrieves keys from the vault command."""
 
+    def __init__(self, cache_ttl: float = 60.0):
+        """
+        Initialize the vault provider.
+
+        Args:
+            cache_ttl: Number of seconds a retrieved key is reused before vault
+                is asked again
+        """
+        self._cache = TTLCache(maxsize=256, ttl=cache_ttl)
+        self._inflight = SingleFlight()
+
     def get_key(self, key_name: str, **kwargs) -> Optional[str]:
         """
         Get a key from the vault command.
@@ -25,15 +38,29 @@ class VaultKeyProvider:
         Returns:
             The key value if successfully retrieved from vault, or None if not found
         """
+        key_value = self._cache.get(key_name)
+        if key_value is None:
+            # Concurrent lookups of the same key share a single vault call
+            key_value = self._inflight.do(key_name, lambda: self._fetch_key(key_name))
+        return key_value
+
+    def _fetch_key(self, key_name: str) -> Optional[str]:
+        """Run the vault command for a key and cache the value it prints."""
         try:
             result = subprocess.run(
-                ["vault", key_name], capture_output=True, text=True, check=True
+                ["vault", key_name], capture_output=True, check=True
             )
-            key_value = result.stdout.strip()
-
-            if key_value and len(key_value) > 0:
-                return key_value
+            key_value = result.stdout.strip().decode("utf-8", "replace") or None
         except (subprocess.SubprocessError, FileNotFoundError) as e:
-            logger.debug(f"Failed to get {key_name} from vault: {e}")
+            logger.debug("Failed to get %s from vault: %s", key_name, e)
+            return None
+
+        if key_value is not None:
+            self._cache.set(key_name, key_value)
+        return key_value
 
-        return None
+    def get_keys(self, key_names: List[str], **kwargs) -> Dict[str, str]:
+        """Get several keys from vault, running the lookups concurrently."""
+        return fetch_concurrently(
+            lambda key_name: self.get_key(key_name, **kwargs), key_names
+        )
@@ -2,50 +2,65 @@
 
 import pytest
 import logging
+from unittest.mock import MagicMock
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 
 
 @pytest.fixture(autouse=True)
-def reset_registry():
-    """Reset the provider registry between tests to ensure isolation."""
-    from secret_key_manager.core import _PROVIDER_REGISTRY
+def reset_registry(monkeypatch):
+    """Give each test an empty provider registry to ensure isolation."""
+    from secret_key_manager import core
 
-    # Store original registry
-    original = dict(_PROVIDER_REGISTRY)
+    # Swap in empty registries instead of copying the real ones; monkeypatch
+    # puts the untouched originals back after the test
+    monkeypatch.setattr(core, "_PROVIDER_REGISTRY", {})
+    monkeypatch.setattr(core, "_PROVIDER_NAME_INDEX", {})
+    monkeypatch.setattr(core, "_PROVIDER_REGISTRY_SORTED", [])
+    monkeypatch.setattr(core, "_PROVIDER_SORT_KEYS", [])
 
-    # Clear registry for each test
-    _PROVIDER_REGISTRY.clear()
 
-    yield
+@pytest.fixture(autouse=True)
+def reset_key_manager(monkeypatch):
+    """Give each test its own shared KeyManager instance."""
+    import secret_key_manager
+    from secret_key_manager import cli, core
 
-    # Restore original registry after test
-    _PROVIDER_REGISTRY.clear()
-    _PROVIDER_REGISTRY.update(original)
+    # Point every module-level ``keys`` reference at a fresh manager;
+    # monkeypatch restores the shared instance afterwards, so _get_manager()
+    # keeps returning the same object as core.keys
+    manager = core.KeyManager()
+    monkeypatch.setattr(core, "keys", manager)
+    monkeypatch.setattr(secret_key_manager, "keys", manager)
+    monkeypatch.setattr(cli, "keys", manager)
 
 
-@pytest.fixture(autouse=True)
-def reset_key_manager():
-    """Reset the KeyManager singleton between tests."""
+@pytest.fixture
+def make_provider():
+    """Return a factory for mock providers that follow KeyProviderProtocol."""
+    from secret_key_manager.protocol import KeyProviderProtocol
+
+    def make(name, key_value=None):
+        # Each mock is built fresh: copies of one would share their child
+        # mocks, leaking return values and calls between tests
+        provider = MagicMock(spec=KeyProviderProtocol)
+        provider.name = name
+        provider.get_key.return_value = key_value
+        return provider
+
+    return make
+
+
+@pytest.fixture
+def make_manager():
+    """Return a factory for KeyManagers that use only the given providers."""
     from secret_key_manager.core import KeyManager
 
-    # Store original instance
-    original_instance = KeyManager._instance
-    original_keys = dict(KeyManager._keys) if KeyManager._instance else {}
-    original_providers = list(KeyManager._providers) if KeyManager._instance else []
-    original_initialized = KeyManager._initialized if KeyManager._instance else False
-
-    # Reset for test
-    KeyManager._instance = None
-    KeyManager._keys = {}
-    KeyManager._providers = []
-    KeyManager._initialized = False
-
-    yield
-
-    # Restore original state
-    KeyManager._instance = original_instance
-    KeyManager._keys = original_keys
-    KeyManager._providers = original_providers
-    KeyManager._initialized = original_initialized
+    def make(*providers):
+        manager = KeyManager()
+        manager._providers = providers
+        manager._initialized = True
+        return manager
+
+    return make
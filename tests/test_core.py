@@ -1,60 +1,86 @@
 """Tests for the core module."""
 
-from unittest.mock import patch, MagicMock
+import pytest
+from unittest.mock import patch
 
 from secret_key_manager.core import (
     KeyProvider,
     KeyManager,
     get_registered_providers,
     initialize_providers,
+    _get_manager,
 )
-from secret_key_manager.protocol import KeyProviderProtocol
 
-
-# Test key provider decorator
-def test_key_provider_decorator():
-    # Reset registry to ensure test isolation
-    from secret_key_manager.core import _PROVIDER_REGISTRY
-
-    _PROVIDER_REGISTRY.clear()
-
-    @KeyProvider(enabled=True, priority=50, name="test_provider")
-    class TestKeyProvider:
-        def get_key(self, key_name):
-            return f"test-{key_name}"
+# These tests share the module-level provider registry and manager singleton,
+# so keep them on one pytest-xdist worker (run with --dist loadgroup)
+pytestmark = pytest.mark.xdist_group("core_singleton")
+
+
+# Test the key provider decorator registers classes with their settings
+@pytest.mark.parametrize(
+    "class_name, kwargs, expected_name, expected_enabled, expected_priority",
+    [
+        (
+            "TestKeyProvider",
+            {"enabled": True, "priority": 50, "name": "test_provider"},
+            "test_provider",
+            True,
+            50,
+        ),
+        # The name is derived from the class name when not given
+        ("CustomKeyProvider", {}, "custom", True, 100),
+        ("DisabledKeyProvider", {"enabled": False}, "disabled", False, 100),
+    ],
+)
+def test_key_provider_registration(
+    class_name, kwargs, expected_name, expected_enabled, expected_priority
+):
+    # A fresh class for every case
+    provider_cls = KeyProvider(**kwargs)(type(class_name, (), {}))
 
     # Check if registered properly
     providers = get_registered_providers()
     assert len(providers) == 1
-    assert providers[0]["name"] == "test_provider"
-    assert providers[0]["enabled"] is True
-    assert providers[0]["priority"] == 50
-    assert providers[0]["class"] == TestKeyProvider
+    assert providers[0]["name"] == expected_name
+    assert providers[0]["enabled"] is expected_enabled
+    assert providers[0]["priority"] == expected_priority
+    assert providers[0]["class"] is provider_cls
+
+    # The name is a plain class attribute, readable without an instance
+    assert provider_cls.name == expected_name
+    assert provider_cls().name == expected_name
+
+
+# Test the sorted provider cache is refreshed on registration
+def test_registered_providers_cache_invalidation():
+    @KeyProvider(priority=20, name="second")
+    class SecondProvider:
+        pass
+
+    assert [p["name"] for p in get_registered_providers()] == ["second"]
 
+    @KeyProvider(priority=10, name="first")
+    class FirstProvider:
+        pass
 
-# Test auto-naming of providers
-def test_key_provider_auto_naming():
-    # Reset registry to ensure test isolation
-    from secret_key_manager.core import _PROVIDER_REGISTRY
+    assert [p["name"] for p in get_registered_providers()] == ["first", "second"]
 
-    _PROVIDER_REGISTRY.clear()
 
-    @KeyProvider()
-    class CustomKeyProvider:
+# Test decorating the same class twice keeps the original registration
+def test_key_provider_reregistration_is_noop():
+    class RepeatKeyProvider:
         pass
 
+    KeyProvider(priority=10)(RepeatKeyProvider)
+    KeyProvider(priority=99)(RepeatKeyProvider)
+
     providers = get_registered_providers()
     assert len(providers) == 1
-    assert providers[0]["name"] == "custom"
+    assert providers[0]["priority"] == 10
 
 
 # Test initialize_providers
 def test_initialize_providers():
-    # Reset registry to ensure test isolation
-    from secret_key_manager.core import _PROVIDER_REGISTRY
-
-    _PROVIDER_REGISTRY.clear()
-
     @KeyProvider(enabled=True)
     class Provider1:
         def get_key(self, key_name):
@@ -71,30 +97,38 @@ def test_initialize_providers():
 
 # Test KeyManager singleton
 def test_key_manager_singleton():
+    manager1 = _get_manager()
+    manager2 = _get_manager()
+    assert manager1 is manager2
+
+
+# Test KeyManager instances keep their own state
+def test_key_manager_instance_state_not_shared(make_provider):
     manager1 = KeyManager()
     manager2 = KeyManager()
-    assert manager1 is manager2
 
+    manager1.set_key("ONLY_IN_FIRST", "value")
 
-# Test KeyManager.get_key
-def test_key_manager_get_key():
-    # Reset the singleton
-    KeyManager._instance = None
-    manager = KeyManager()
+    assert manager1._keys is not manager2._keys
+    assert "ONLY_IN_FIRST" not in manager2._keys
+    assert "_keys" not in vars(KeyManager)
 
-    # Create a mock provider
-    mock_provider = MagicMock(spec=KeyProviderProtocol)
-    mock_provider.name = "mock"
-    mock_provider.get_key.return_value = "test-key-value"
+    manager1.register_provider(make_provider("only_first"))
+    assert manager1.get_providers() == ["only_first"]
+    assert manager2.get_providers() == []
 
-    # Register the mock provider
-    manager._providers = [mock_provider]
-    manager._initialized = True
+
+# Test KeyManager.get_key
+def test_key_manager_get_key(make_provider, make_manager):
+    # Create a manager with a mock provider
+    mock_provider = make_provider("mock", "test-key-value")
+    manager = make_manager(mock_provider)
 
     # Test getting a key
     key = manager.get_key("TEST_API_KEY")
     assert key == "test-key-value"
-    mock_provider.get_key.assert_called_once_with("TEST_API_KEY")
+    assert mock_provider.get_key.call_count == 1
+    assert mock_provider.get_key.call_args.args == ("TEST_API_KEY",)
 
     # Test that key was cached
     assert manager._keys["TEST_API_KEY"] == "test-key-value"
@@ -108,8 +142,6 @@ def test_key_manager_get_key():
 
 # Test KeyManager.set_key
 def test_key_manager_set_key():
-    # Reset the singleton
-    KeyManager._instance = None
     manager = KeyManager()
 
     # Set a key manually
@@ -123,55 +155,500 @@ def test_key_manager_set_key():
 
 
 # Test KeyManager.ensure_key
-@patch("secret_key_manager.core.logger")
-def test_key_manager_ensure_key(mock_logger):
-    # Reset the singleton
-    KeyManager._instance = None
+@pytest.mark.parametrize("key_value, expected", [("exists", True), (None, False)])
+def test_key_manager_ensure_key(
+    mocker, key_value, expected, make_provider, make_manager
+):
+    mock_logger = mocker.patch("secret_key_manager.core.logger")
+    manager = make_manager(make_provider("mock", key_value))
+
+    assert manager.ensure_key("TEST_KEY") is expected
+    # A missing key is reported as an error
+    assert mock_logger.error.called is not expected
+
+
+# Test KeyManager provider filtering
+def test_key_manager_provider_filtering(make_provider, make_manager):
+    # Create a manager with multiple mock providers
+    provider1 = make_provider("provider1", "value1")
+    provider2 = make_provider("provider2", "value2")
+    manager = make_manager(provider1, provider2)
+
+    # Test filtering to use only provider2
+    key = manager.get_key("TEST_KEY", providers=["provider2"])
+    assert key == "value2"
+    provider1.get_key.assert_not_called()
+    assert provider2.get_key.call_count == 1
+
+    # Requested providers are tried in the caller's order
+    manager.invalidate()
+    key = manager.get_key("TEST_KEY", providers=["provider2", "provider1", "unknown"])
+    assert key == "value2"
+    provider1.get_key.assert_not_called()
+
+
+# Test KeyManager enable/disable by provider name
+@patch.dict("os.environ")
+def test_key_manager_enable_disable_provider():
+    @KeyProvider(enabled=False, priority=10, name="toggled")
+    class ToggledProvider:
+        def get_key(self, key_name, **kwargs):
+            return "toggled-value"
+
     manager = KeyManager()
+    assert manager.get_providers() == []
 
-    # Set up a provider that will return a key
-    mock_provider_success = MagicMock(spec=KeyProviderProtocol)
-    mock_provider_success.name = "success"
-    mock_provider_success.get_key.return_value = "exists"
+    assert manager.enable_provider("toggled") is True
+    assert manager.get_providers() == ["toggled"]
+    assert manager.get_key("ANY_KEY") == "toggled-value"
 
-    # Set up a provider that will not return a key
-    mock_provider_fail = MagicMock(spec=KeyProviderProtocol)
-    mock_provider_fail.name = "fail"
-    mock_provider_fail.get_key.return_value = None
+    assert manager.disable_provider("toggled") is True
+    assert manager.get_providers() == []
 
-    # Test successful case
-    manager._providers = [mock_provider_success]
-    manager._initialized = True
-    assert manager.ensure_key("EXISTS") is True
-    mock_logger.error.assert_not_called()
+    assert manager.enable_provider("missing") is False
+    assert manager.disable_provider("missing") is False
 
-    # Test failure case
-    manager._providers = [mock_provider_fail]
-    assert manager.ensure_key("MISSING") is False
-    mock_logger.error.assert_called()
 
+# Test KeyManager caches failed lookups until the key is set
+def test_key_manager_caches_misses(make_provider, make_manager):
+    mock_provider = make_provider("mock")
+    manager = make_manager(mock_provider)
+
+    assert manager.get_key("MISSING_KEY") is None
+    assert manager.get_key("MISSING_KEY") is None
+    assert mock_provider.get_key.call_count == 1
+    assert mock_provider.get_key.call_args.args == ("MISSING_KEY",)
+
+    manager.set_key("MISSING_KEY", "now-set")
+    assert manager.get_key("MISSING_KEY") == "now-set"
+
+    # Invalidating forgets both the value and the cached miss
+    manager.invalidate("MISSING_KEY")
+    mock_provider.get_key.reset_mock()
+    assert manager.get_key("MISSING_KEY") is None
+    assert mock_provider.get_key.call_count == 1
+    assert mock_provider.get_key.call_args.args == ("MISSING_KEY",)
+
+
+# Test a cached miss does not hide a key exported to the environment later
+@patch.dict("os.environ")
+def test_key_manager_miss_ignored_once_exported(make_manager):
+    import os
+
+    from secret_key_manager.providers.env import EnvKeyProvider
+
+    os.environ.pop("LATE_EXPORTED_KEY", None)
+    manager = make_manager(EnvKeyProvider())
+
+    assert manager.get_key("LATE_EXPORTED_KEY") is None
+    os.environ["LATE_EXPORTED_KEY"] = "exported"
+    assert manager.get_key("LATE_EXPORTED_KEY") == "exported"
+
+
+# Test enabling a provider only instantiates that provider, in priority order
+def test_key_manager_enable_provider_incremental():
+    created = []
+
+    @KeyProvider(priority=10, name="first")
+    class FirstProvider:
+        def __init__(self):
+            created.append("first")
+
+    @KeyProvider(enabled=False, priority=5, name="late")
+    class LateProvider:
+        def __init__(self):
+            created.append("late")
 
-# Test KeyManager provider filtering
-def test_key_manager_provider_filtering():
-    # Reset the singleton
-    KeyManager._instance = None
     manager = KeyManager()
+    assert manager.get_providers() == ["first"]
 
-    # Create multiple mock providers
-    provider1 = MagicMock(spec=KeyProviderProtocol)
-    provider1.name = "provider1"
-    provider1.get_key.return_value = "value1"
+    manager.enable_provider("late")
+    assert manager.get_providers() == ["late", "first"]
+    assert created == ["first", "late"]
 
-    provider2 = MagicMock(spec=KeyProviderProtocol)
-    provider2.name = "provider2"
-    provider2.get_key.return_value = "value2"
+    manager.disable_provider("first")
+    assert manager.get_providers() == ["late"]
+    assert created == ["first", "late"]
 
-    # Register providers
-    manager._providers = [provider1, provider2]
-    manager._initialized = True
 
-    # Test filtering to use only provider2
-    key = manager.get_key("TEST_KEY", providers=["provider2"])
-    assert key == "value2"
-    provider1.get_key.assert_not_called()
-    provider2.get_key.assert_called_once()
+# Test re-enabling a provider keeps registration order among equal priorities
+def test_key_manager_reenable_keeps_tie_order():
+    @KeyProvider(priority=30, name="a")
+    class AProvider:
+        pass
+
+    @KeyProvider(priority=30, name="b")
+    class BProvider:
+        pass
+
+    manager = KeyManager()
+    manager.register_provider(type("Manual", (), {"name": "manual"})())
+    assert manager.get_providers() == ["a", "b", "manual"]
+
+    manager.disable_provider("a")
+    manager.enable_provider("a")
+    assert manager.get_providers() == ["a", "b", "manual"]
+    assert KeyManager().get_providers() == ["a", "b"]
+
+
+# Test toggling providers before first use does not instantiate anything
+def test_key_manager_toggle_before_initialize():
+    created = []
+
+    @KeyProvider(priority=10, name="eager")
+    class EagerProvider:
+        def __init__(self):
+            created.append("eager")
+
+    manager = KeyManager()
+    assert manager.disable_provider("eager") is True
+    assert manager.enable_provider("eager") is True
+    assert created == []
+
+    assert manager.get_providers() == ["eager"]
+    assert created == ["eager"]
+
+
+# Test KeyManager only exports keys to the environment when asked to
+@patch.dict("os.environ")
+def test_key_manager_propagate_env(make_provider, make_manager):
+    import os
+
+    manager = make_manager(make_provider("mock", "env-value"))
+
+    manager.propagate_env = False
+    assert manager.get_key("NOT_EXPORTED_KEY") == "env-value"
+    assert "NOT_EXPORTED_KEY" not in os.environ
+
+    manager.propagate_env = True
+    assert manager.get_key("EXPORTED_KEY") == "env-value"
+    assert os.environ["EXPORTED_KEY"] == "env-value"
+
+
+# Test a new class registered under an existing class name replaces the entry
+def test_key_provider_replacement_keeps_order():
+    def make_provider(priority):
+        class ReloadedKeyProvider:
+            pass
+
+        return KeyProvider(priority=priority)(ReloadedKeyProvider)
+
+    @KeyProvider(priority=20, name="middle")
+    class MiddleProvider:
+        pass
+
+    make_provider(10)
+    replacement = make_provider(30)
+
+    providers = get_registered_providers()
+    assert [p["name"] for p in providers] == ["middle", "reloaded"]
+    assert providers[1]["class"] is replacement
+
+
+# Test provider info is only requested once per provider instance
+def test_key_manager_caches_provider_info():
+    @KeyProvider(priority=10, name="described")
+    class DescribedProvider:
+        info_calls = 0
+        write_checks = 0
+
+        def supports_write(self):
+            DescribedProvider.write_checks += 1
+            return True
+
+        def get_provider_info(self):
+            DescribedProvider.info_calls += 1
+            return {"name": "described"}
+
+    manager = KeyManager()
+    first = manager.get_provider_status()
+    first["described"]["capabilities"]["name"] = "changed"
+
+    second = manager.get_provider_status()
+    assert second["described"]["capabilities"] == {"name": "described"}
+    assert second["described"]["supports_write"] is True
+    assert DescribedProvider.info_calls == 1
+    assert DescribedProvider.write_checks == 1
+
+    # A new instance of the provider is asked again
+    manager.disable_provider("described")
+    manager.enable_provider("described")
+    manager.get_provider_status()
+    assert DescribedProvider.info_calls == 2
+
+
+# Test a reader overlapping a provider change does not leave a stale snapshot
+def test_key_manager_snapshot_follows_provider_changes():
+    import threading
+
+    @KeyProvider(priority=10, name="first")
+    class SlowNameProvider:
+        def __init__(self):
+            self.block = False
+            self.reading = threading.Event()
+            self.release = threading.Event()
+
+        @property
+        def name(self):
+            # Pause the next reader in the middle of building its snapshot
+            if self.block:
+                self.block = False
+                self.reading.set()
+                self.release.wait(5)
+            return "first"
+
+    @KeyProvider(enabled=False, priority=20, name="late")
+    class LateProvider:
+        pass
+
+    manager = KeyManager()
+    manager._initialize()
+
+    slow = manager._by_name["first"]
+    slow.block = True
+    reader = threading.Thread(target=manager.get_providers)
+    reader.start()
+    assert slow.reading.wait(5)
+
+    manager.enable_provider("late")
+    slow.release.set()
+    reader.join()
+
+    assert manager.get_providers() == ["first", "late"]
+
+
+# Test a lookup overlapping a provider change does not record a stale miss
+def test_key_manager_miss_follows_provider_changes():
+    import threading
+
+    reading = threading.Event()
+    release = threading.Event()
+
+    @KeyProvider(priority=10, name="slow")
+    class SlowProvider:
+        def get_key(self, key_name, **kwargs):
+            reading.set()
+            release.wait(5)
+            return None
+
+    @KeyProvider(enabled=False, priority=20, name="late")
+    class LateProvider:
+        def get_key(self, key_name, **kwargs):
+            return "late-value"
+
+    manager = KeyManager()
+    manager.propagate_env = False
+    manager._initialize()
+
+    reader = threading.Thread(target=manager.get_key, args=("RACED_KEY",))
+    reader.start()
+    assert reading.wait(5)
+
+    manager.enable_provider("late")
+    release.set()
+    reader.join()
+
+    assert manager.get_key("RACED_KEY") == "late-value"
+
+
+# Test concurrent first use initializes the providers only once
+def test_key_manager_initializes_once_across_threads():
+    import threading
+    import time
+
+    created = []
+
+    @KeyProvider(priority=10, name="slow")
+    class SlowProvider:
+        def __init__(self):
+            time.sleep(0.01)
+            created.append(self)
+
+        def get_key(self, key_name, **kwargs):
+            return None
+
+    manager = KeyManager()
+    threads = [threading.Thread(target=manager.get_providers) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert manager.get_providers() == ["slow"]
+
+
+# Test a provider constructor can look up keys through its own manager
+def test_key_manager_provider_init_reentrant():
+    import threading
+
+    manager = KeyManager()
+    seen = []
+
+    @KeyProvider(priority=10, name="base")
+    class BaseProvider:
+        def __init__(self):
+            seen.append(manager.get_key("BASE_INIT_KEY"))
+
+        def get_key(self, key_name, **kwargs):
+            return "base-value"
+
+    @KeyProvider(enabled=False, priority=20, name="dependent")
+    class DependentProvider:
+        def __init__(self):
+            seen.append(manager.get_key("DEPENDENT_INIT_KEY"))
+
+        def get_key(self, key_name, **kwargs):
+            return None
+
+    def use_manager():
+        manager.get_providers()
+        manager.enable_provider("dependent")
+
+    # Run in a thread so a deadlock fails the test instead of hanging it
+    thread = threading.Thread(target=use_manager, daemon=True)
+    thread.start()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert manager.get_providers() == ["base", "dependent"]
+    # Nothing was published while base was being built; dependent sees base
+    assert seen == [None, "base-value"]
+    assert manager.get_key("BASE_INIT_KEY") == "base-value"
+
+
+# Test writable providers are computed once per provider list
+def test_key_manager_caches_writable_providers(make_provider, make_manager):
+    writable = make_provider("writable")
+    writable.supports_write.return_value = True
+    read_only = make_provider("read_only")
+    read_only.supports_write.return_value = False
+
+    manager = make_manager(writable, read_only)
+
+    assert manager.get_writable_providers() == ["writable"]
+    assert manager.get_writable_providers() == ["writable"]
+    writable.supports_write.assert_called_once_with()
+
+    # Changing the provider list recomputes the snapshot
+    another = make_provider("another")
+    another.supports_write.return_value = True
+    manager.register_provider(another)
+    assert manager.get_writable_providers() == ["writable", "another"]
+
+
+# Test set_key only persists to writable providers whose validation passes
+def test_key_manager_set_key_persist(make_provider, make_manager):
+    writable = make_provider("writable")
+    writable.supports_write.return_value = True
+    writable.validate_key.return_value = True
+    writable.write_key.return_value = True
+
+    rejecting = make_provider("rejecting")
+    rejecting.supports_write.return_value = True
+    rejecting.validate_key.return_value = False
+
+    read_only = make_provider("read_only")
+    read_only.supports_write.return_value = False
+
+    manager = make_manager(writable, rejecting, read_only)
+
+    assert manager.set_key("PERSISTED_KEY", "value", persist=True) is True
+    writable.write_key.assert_called_once_with("PERSISTED_KEY", "value")
+    rejecting.write_key.assert_not_called()
+    read_only.validate_key.assert_not_called()
+    read_only.write_key.assert_not_called()
+
+    assert (
+        manager.set_key("OTHER_KEY", "value", persist=True, providers=["rejecting"])
+        is False
+    )
+    writable.write_key.assert_called_once()
+
+
+# Test providers that report not holding a key are skipped
+def test_key_manager_skips_providers_without_key(make_provider, make_manager):
+    lacking = make_provider("lacking")
+    lacking.has_key.return_value = False
+
+    unsure = make_provider("unsure", "unsure-value")
+    unsure.has_key.return_value = None
+
+    manager = make_manager(lacking, unsure)
+    manager.propagate_env = False
+
+    assert manager.get_key("SOME_KEY") == "unsure-value"
+    lacking.has_key.assert_called_once_with("SOME_KEY")
+    lacking.get_key.assert_not_called()
+    unsure.get_key.assert_called_once_with("SOME_KEY")
+
+
+# Test get_keys asks each provider once for all keys still missing
+def test_key_manager_get_keys(make_provider, make_manager):
+    batch = make_provider("batch")
+    batch.has_key.return_value = None
+    batch.get_keys.return_value = {"FIRST_KEY": "first-value"}
+
+    class SingleProvider:
+        name = "single"
+
+        def __init__(self):
+            self.requested = []
+
+        def get_key(self, key_name, **kwargs):
+            self.requested.append(key_name)
+            return "second-value" if key_name == "SECOND_KEY" else None
+
+    single = SingleProvider()
+    manager = make_manager(batch, single)
+    manager.propagate_env = False
+    manager.set_key("CACHED_KEY", "cached-value")
+
+    result = manager.get_keys(["CACHED_KEY", "FIRST_KEY", "SECOND_KEY", "NO_KEY"])
+    assert result == {
+        "CACHED_KEY": "cached-value",
+        "FIRST_KEY": "first-value",
+        "SECOND_KEY": "second-value",
+        "NO_KEY": None,
+    }
+    batch.get_keys.assert_called_once_with(["FIRST_KEY", "SECOND_KEY", "NO_KEY"])
+    assert single.requested == ["SECOND_KEY", "NO_KEY"]
+
+    # Resolved keys are cached and missing ones are remembered as misses
+    assert manager.get_keys(["FIRST_KEY", "NO_KEY"]) == {
+        "FIRST_KEY": "first-value",
+        "NO_KEY": None,
+    }
+    batch.get_keys.assert_called_once()
+    assert manager.get_key("SECOND_KEY") == "second-value"
+
+
+# Test aget_key queries providers concurrently and prefers higher priority
+def test_key_manager_aget_key(make_manager):
+    import asyncio
+    import threading
+
+    # Both lookups must be in flight at the same time to get past the barrier
+    barrier = threading.Barrier(2, timeout=5)
+
+    class SlowProvider:
+        def __init__(self, name, value):
+            self.name = name
+            self.value = value
+
+        def get_key(self, key_name, **kwargs):
+            barrier.wait()
+            return self.value
+
+    manager = make_manager(
+        SlowProvider("first", "first-value"),
+        SlowProvider("second", "second-value"),
+    )
+    manager.propagate_env = False
+
+    assert asyncio.run(manager.aget_key("ASYNC_KEY")) == "first-value"
+    assert manager.get_key("ASYNC_KEY") == "first-value"
+
+    barrier.reset()
+    result = asyncio.run(manager.aget_key("OTHER_KEY", ["second", "first"]))
+    assert result == "second-value"
@@ -1,130 +1,214 @@
 """Tests for built-in key providers."""
 
+import contextlib
 import os
-import tempfile
+import stat
+import subprocess
 import json
+import shutil
+import importlib.util
+import threading
+import time
 import pytest
-from unittest.mock import patch, MagicMock, mock_open
-
-# Conditionally import yaml for testing
-try:
-    import yaml  # noqa: F401 - needed for pytest.mark.skipif condition
-
-    HAS_YAML = True
-except ImportError:
-    HAS_YAML = False
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, MagicMock
 
 from secret_key_manager.providers.env import EnvKeyProvider
 from secret_key_manager.providers.file import JsonFileKeyProvider, YamlFileKeyProvider
-from secret_key_manager.providers.onepassword import OnePasswordKeyProvider
+from secret_key_manager.providers.onepassword import (
+    OnePasswordKeyProvider,
+    _load_config as _load_onepassword_config,
+    _read_config as _read_onepassword_config,
+)
 from secret_key_manager.providers.lastpass import LastPassKeyProvider
+from secret_key_manager.providers.vault import VaultKeyProvider
 
-# Conditionally import DotEnvProvider for testing
-try:
-    from secret_key_manager.providers.dotenv import DotEnvProvider
+# DotEnvProvider only needs python-dotenv once it is used
+from secret_key_manager.providers.dotenv import HAS_DOTENV, DotEnvProvider
 
-    HAS_DOTENV = True
-except ImportError:
-    HAS_DOTENV = False
+# KeyringProvider only imports keyring once it is used
+from secret_key_manager.providers.keyring_provider import HAS_KEYRING, KeyringProvider
 
+# Probe for PyYAML without importing it; the YAML provider imports it on use
+HAS_YAML = importlib.util.find_spec("yaml") is not None
 
-# Test environment variable provider
-def test_env_provider():
-    provider = EnvKeyProvider()
 
+@pytest.fixture(scope="session")
+def env_provider():
+    """Environment variable provider shared by the tests; it keeps no state."""
+    return EnvKeyProvider()
+
+
+# Test environment variable provider
+def test_env_provider(env_provider, monkeypatch):
     # Test key that doesn't exist
-    assert provider.get_key("NONEXISTENT_KEY") is None
+    monkeypatch.delenv("NONEXISTENT_KEY", raising=False)
+    assert env_provider.get_key("NONEXISTENT_KEY") is None
 
     # Test key that exists
-    with patch.dict(os.environ, {"TEST_KEY": "test-value"}):
-        assert provider.get_key("TEST_KEY") == "test-value"
+    monkeypatch.setenv("TEST_KEY", "test-value")
+    assert env_provider.get_key("TEST_KEY") == "test-value"
+
+    # Empty values count as missing
+    monkeypatch.setenv("TEST_KEY", "")
+    assert env_provider.get_key("TEST_KEY") is None
 
     # Verify provider name
-    assert provider.name == "environment"
+    assert env_provider.name == "environment"
+
+
+# Keys in the JSON file shared by the JSON file provider tests
+JSON_TEST_KEYS = {"TEST_KEY": "json-secret-value", "ANOTHER_KEY": "another-value"}
+
+
+@pytest.fixture(scope="session")
+def json_keys_file(tmp_path_factory):
+    """Write the JSON test keys once per session; tests must not modify it."""
+    file_path = tmp_path_factory.mktemp("data") / "keys.json"
+    file_path.write_text(json.dumps(JSON_TEST_KEYS))
+    return file_path
 
 
 # Test JSON file provider
-def test_json_file_provider():
-    # Create a temporary file for testing
-    with tempfile.NamedTemporaryFile(suffix=".json", mode="w+") as temp_file:
-        # Write test data to the file
-        test_data = {"TEST_KEY": "json-secret-value", "ANOTHER_KEY": "another-value"}
-        json.dump(test_data, temp_file)
-        temp_file.flush()
+def test_json_file_provider(json_keys_file):
+    provider = JsonFileKeyProvider(file_path=str(json_keys_file))
 
-        # Create provider instance with the temporary file
-        provider = JsonFileKeyProvider(file_path=temp_file.name)
+    # Test key retrieval
+    assert provider.get_key("TEST_KEY") == "json-secret-value"
+    assert provider.get_key("ANOTHER_KEY") == "another-value"
+    assert provider.get_key("NONEXISTENT_KEY") is None
+    assert provider.has_key("TEST_KEY") is True
+    assert provider.has_key("NONEXISTENT_KEY") is False
 
-        # Test key retrieval
-        assert provider.get_key("TEST_KEY") == "json-secret-value"
-        assert provider.get_key("ANOTHER_KEY") == "another-value"
-        assert provider.get_key("NONEXISTENT_KEY") is None
+    # Verify provider name
+    assert provider.name == "json_file"
 
-        # Test writing a key
-        assert provider.supports_write() is True
-        result = provider.write_key("NEW_KEY", "new-value")
-        assert result is True
 
-        # Verify provider name
-        assert provider.name == "json_file"
+# Test writing keys with the JSON file provider
+def test_json_file_provider_write(json_keys_file, tmp_path):
+    # Work on a copy so the shared file stays unchanged
+    temp_file = tmp_path / "keys.json"
+    shutil.copy(json_keys_file, temp_file)
+    provider = JsonFileKeyProvider(file_path=str(temp_file))
+
+    # Test writing a key
+    assert provider.supports_write() is True
+    result = provider.write_key("NEW_KEY", "new-value")
+    assert result is True
+    assert provider.has_key("NEW_KEY") is True
+
+    # Existing keys are preserved alongside the new one
+    saved = json.loads(temp_file.read_text())
+    assert saved == {**JSON_TEST_KEYS, "NEW_KEY": "new-value"}
+
+
+# Saving replaces the file atomically and keeps its permissions
+@pytest.mark.skipif(os.name == "nt", reason="POSIX file modes and symlinks")
+def test_json_file_provider_atomic_save(tmp_path):
+    file_path = tmp_path / "nested" / "keys.json"
+    provider = JsonFileKeyProvider(file_path=str(file_path))
+    assert provider.write_key("FIRST_KEY", "first-value") is True
+
+    # New files are private
+    assert stat.S_IMODE(os.stat(file_path).st_mode) == 0o600
+
+    os.chmod(file_path, 0o640)
+    assert provider.write_key("SECOND_KEY", "second-value") is True
+
+    assert json.loads(file_path.read_text()) == {
+        "FIRST_KEY": "first-value",
+        "SECOND_KEY": "second-value",
+    }
+    assert stat.S_IMODE(os.stat(file_path).st_mode) == 0o640
+    assert os.listdir(file_path.parent) == ["keys.json"]
+
+
+# Saving through a symlink replaces the file it points to, not the link
+@pytest.mark.skipif(os.name == "nt", reason="POSIX file modes and symlinks")
+def test_json_file_provider_save_through_symlink(tmp_path):
+    target = tmp_path / "real-keys.json"
+    target.write_text("{}")
+    link = tmp_path / "keys.json"
+    link.symlink_to(target)
+
+    provider = JsonFileKeyProvider(file_path=str(link))
+    assert provider.write_key("LINKED_KEY", "linked-value") is True
+
+    assert link.is_symlink()
+    assert json.loads(target.read_text()) == {"LINKED_KEY": "linked-value"}
+    assert sorted(os.listdir(tmp_path)) == ["keys.json", "real-keys.json"]
 
 
 # Test YAML file provider
 @pytest.mark.skipif(not HAS_YAML, reason="PyYAML not installed")
-def test_yaml_file_provider():
-    # Create a temporary file for testing
-    with tempfile.NamedTemporaryFile(suffix=".yaml", mode="w+") as temp_file:
-        # Write test data to the file
-        test_data = """
+def test_yaml_file_provider(tmp_path):
+    # Write test data to a temporary file
+    temp_file = tmp_path / "keys.yaml"
+    temp_file.write_text(
+        """
 TEST_KEY: yaml-secret-value
 ANOTHER_KEY: another-value
 """
-        temp_file.write(test_data)
-        temp_file.flush()
+    )
 
-        # Create provider instance with the temporary file
-        provider = YamlFileKeyProvider(file_path=temp_file.name)
+    # Create provider instance with the temporary file
+    provider = YamlFileKeyProvider(file_path=str(temp_file))
 
-        # Test key retrieval
-        assert provider.get_key("TEST_KEY") == "yaml-secret-value"
-        assert provider.get_key("ANOTHER_KEY") == "another-value"
-        assert provider.get_key("NONEXISTENT_KEY") is None
+    # Test key retrieval
+    assert provider.get_key("TEST_KEY") == "yaml-secret-value"
+    assert provider.get_key("ANOTHER_KEY") == "another-value"
+    assert provider.get_key("NONEXISTENT_KEY") is None
 
-        # Test writing a key
-        assert provider.supports_write() is True
-        result = provider.write_key("NEW_KEY", "new-value")
-        assert result is True
+    # Test writing a key
+    assert provider.supports_write() is True
+    result = provider.write_key("NEW_KEY", "new-value")
+    assert result is True
 
-        # Verify provider name
-        assert provider.name == "yaml_file"
+    # Verify provider name
+    assert provider.name == "yaml_file"
+
+
+@pytest.fixture
+def completed_process():
+    """Return a factory for the results of successful subprocess.run calls."""
+
+    def make(stdout, returncode=0, stderr=b""):
+        return MagicMock(returncode=returncode, stdout=stdout, stderr=stderr)
+
+    return make
+
+
+@pytest.fixture
+def fresh_onepassword_config():
+    """Make the 1Password provider read its config file again."""
+    _read_onepassword_config.cache_clear()
+    yield
+    _read_onepassword_config.cache_clear()
 
 
 # Test 1Password provider
-@patch("subprocess.run")
-@patch("os.path.expanduser")
-@patch(
-    "builtins.open",
-    new_callable=mock_open,
-    read_data='{"account": "test.1password.com", "env_file": "~/.local/.env"}',
-)
-def test_onepassword_provider(mock_file, mock_expanduser, mock_subprocess):
+def test_onepassword_provider(mocker, completed_process, fresh_onepassword_config):
+    mocker.patch("secret_key_manager.providers.onepassword._OP_PATH", "/usr/bin/op")
+    mocker.patch(
+        "builtins.open",
+        mocker.mock_open(
+            read_data='{"account": "test.1password.com", "env_file": "~/.local/.env"}'
+        ),
+    )
     # Mock expanduser to return a simple path
-    mock_expanduser.return_value = "/tmp/.config"
-
-    # Mock subprocess.run for version check
-    version_process = MagicMock()
-    version_process.returncode = 0
+    mocker.patch("os.path.expanduser", return_value="/tmp/.config")
 
     # Mock subprocess.run for signin
-    signin_process = MagicMock()
-    signin_process.returncode = 0
+    signin_process = completed_process(b'export OP_SESSION_test="session-token"\n')
 
-    # Mock subprocess.run for key retrieval
-    key_process = MagicMock()
-    key_process.returncode = 0
-    key_process.stdout = "secret-value"
+    # Mock subprocess.run for loading the secrets
+    env_process = completed_process(
+        json.dumps({"TEST_KEY": "secret-value", "OTHER_KEY": "other-value"}).encode()
+    )
 
-    mock_subprocess.side_effect = [version_process, signin_process, key_process]
+    mock_subprocess = mocker.patch(
+        "subprocess.run", side_effect=[signin_process, env_process, env_process]
+    )
 
     # Create provider instance
     provider = OnePasswordKeyProvider()
@@ -133,91 +217,394 @@ def test_onepassword_provider(mock_file, mock_expanduser, mock_subprocess):
     result = provider.get_key("TEST_KEY")
     assert result == "secret-value"
 
+    # Later lookups are served from the loaded secrets
+    assert provider.get_key("OTHER_KEY") == "other-value"
+    assert provider.get_key("MISSING_KEY") is None
+
     # Verify provider name
     assert provider.name == "1password"
 
+    # The config is read once and shared read-only between instances
+    assert OnePasswordKeyProvider().config is provider.config
+    with pytest.raises(TypeError):
+        provider.config["account"] = "other.1password.com"
+
     # Verify subprocess calls
-    assert mock_subprocess.call_count == 3
+    assert mock_subprocess.call_count == 2
 
     # Check the calls were made correctly
     calls = mock_subprocess.call_args_list
-    assert "op" in calls[0][0][0]
-    assert "signin" in calls[1][0][0]
-    assert "run" in calls[2][0][0]
-    assert "TEST_KEY" in calls[2][0][0]
+    assert "signin" in calls[0][0][0]
+    assert "run" in calls[1][0][0]
+    assert "--env-file=/tmp/.config" in calls[1][0][0]
+    assert calls[1][1]["env"]["OP_SESSION_test"] == "session-token"
+
+    # Refreshing loads the secrets again with the same session
+    provider.refresh()
+    assert provider.get_key("TEST_KEY") == "secret-value"
+    assert mock_subprocess.call_count == 3
+    assert "run" in mock_subprocess.call_args_list[2][0][0]
 
 
-# Test LastPass provider
-@patch("subprocess.run")
-def test_lastpass_provider(mock_subprocess):
-    # Mock subprocess.run for help check
-    help_process = MagicMock()
-    help_process.returncode = 0
+# Test the 1Password config is only parsed again after the file changes
+def test_onepassword_config_reloads_on_change(tmp_path, fresh_onepassword_config):
+    config_file = tmp_path / ".config"
+    config_file.write_text('{"account": "first.1password.com"}')
 
-    # Mock subprocess.run for key retrieval
-    key_process = MagicMock()
-    key_process.returncode = 0
-    key_process.stdout = "lastpass-secret-value"
+    with patch("os.path.expanduser", return_value=str(tmp_path)):
+        config = _load_onepassword_config()
+        assert config["account"] == "first.1password.com"
+        assert config["env_file"] == "~/.local/.env"
+        assert _load_onepassword_config() is config
 
-    mock_subprocess.side_effect = [help_process, key_process]
+        config_file.write_text('{"account": "second.1password.com"}')
+        os.utime(config_file, ns=(0, config_file.stat().st_mtime_ns + 1))
+        assert _load_onepassword_config()["account"] == "second.1password.com"
 
-    # Create provider instance
-    provider = LastPassKeyProvider()
 
-    # Test key retrieval
-    result = provider.get_key("LASTPASS_KEY")
-    assert result == "lastpass-secret-value"
+# Test a missing 1Password config is created with the defaults
+def test_onepassword_config_created(tmp_path, fresh_onepassword_config):
+    config_dir = tmp_path / "secret-key-manager"
 
-    # Verify provider name
-    assert provider.name == "lastpass"
+    with patch("os.path.expanduser", return_value=str(config_dir)):
+        assert dict(_load_onepassword_config()) == {
+            "account": "my.1password.com",
+            "env_file": "~/.local/.env",
+        }
 
-    # Verify subprocess calls
+    assert json.loads((config_dir / ".config").read_text()) == {
+        "account": "my.1password.com",
+        "env_file": "~/.local/.env",
+    }
+
+
+# Test the 1Password provider signs in again when its session expired
+@patch("secret_key_manager.providers.onepassword._OP_PATH", "/usr/bin/op")
+@patch("subprocess.run")
+@patch(
+    "secret_key_manager.providers.onepassword._load_config",
+    return_value={"account": "test.1password.com", "env_file": "/tmp/.env"},
+)
+def test_onepassword_provider_session_expired(
+    mock_load_config, mock_subprocess, completed_process
+):
+    signin_process = completed_process(b"")
+    expired_process = completed_process(
+        b"", returncode=1, stderr=b"[ERROR] You are not currently signed in."
+    )
+    env_process = completed_process(b'{"TEST_KEY": "secret-value"}')
+
+    mock_subprocess.side_effect = [
+        signin_process,
+        expired_process,
+        signin_process,
+        env_process,
+    ]
+
+    provider = OnePasswordKeyProvider()
+    assert provider.get_key("TEST_KEY") == "secret-value"
+
+    commands = [c[0][0][1] for c in mock_subprocess.call_args_list]
+    assert commands == ["signin", "run", "signin", "run"]
+
+
+# Test the 1Password provider fetches several keys with one op run call
+@patch("secret_key_manager.providers.onepassword._OP_PATH", "/usr/bin/op")
+@patch("subprocess.run")
+@patch(
+    "secret_key_manager.providers.onepassword._load_config",
+    return_value={"account": "test.1password.com", "env_file": "/tmp/.env"},
+)
+def test_onepassword_provider_get_keys(
+    mock_load_config, mock_subprocess, completed_process
+):
+    signin_process = completed_process(b"")
+    env_process = completed_process(
+        b'{"FIRST_KEY": "first-value\\n", "SECOND_KEY": ""}\n'
+    )
+    mock_subprocess.side_effect = [signin_process, env_process]
+
+    provider = OnePasswordKeyProvider()
+    assert provider.get_keys(["FIRST_KEY", "SECOND_KEY", "THIRD_KEY"]) == {
+        "FIRST_KEY": "first-value"
+    }
     assert mock_subprocess.call_count == 2
 
-    # Check the calls were made correctly
-    calls = mock_subprocess.call_args_list
-    assert "olp" in calls[0][0][0]
-    assert "LASTPASS_KEY" in calls[1][0][0]
+
+# Test the 1Password provider resolves secrets with the SDK when configured
+@patch("secret_key_manager.providers.onepassword.HAS_ONEPASSWORD_SDK", True)
+@patch("secret_key_manager.providers.onepassword._OP_PATH", None)
+@patch.dict("os.environ", {"OP_SERVICE_ACCOUNT_TOKEN": "service-token"})
+@patch("subprocess.run")
+def test_onepassword_provider_sdk(mock_subprocess, tmp_path):
+    env_file = tmp_path / ".env"
+    env_file.write_text(
+        '# Secrets\nexport SDK_KEY="op://vault/item/field"\nPLAIN_KEY=plain-value\n'
+    )
+    resolved = []
+
+    async def fake_resolve(token, references):
+        resolved.append((token, references))
+        return {name: "sdk-value" for name in references}
+
+    with patch(
+        "secret_key_manager.providers.onepassword._load_config",
+        return_value={"account": "test.1password.com", "env_file": str(env_file)},
+    ):
+        with patch(
+            "secret_key_manager.providers.onepassword._sdk_resolve", fake_resolve
+        ):
+            provider = OnePasswordKeyProvider()
+            assert provider.get_key("SDK_KEY") == "sdk-value"
+            assert provider.get_key("PLAIN_KEY") == "plain-value"
+
+    assert resolved == [("service-token", {"SDK_KEY": "op://vault/item/field"})]
+    mock_subprocess.assert_not_called()
+
+
+# Test the vault provider fetches several keys
+@patch("subprocess.run")
+def test_vault_provider_get_keys(mock_subprocess):
+    def run(command, **kwargs):
+        if command[1] == "MISSING_KEY":
+            raise subprocess.CalledProcessError(1, command)
+        return MagicMock(stdout=f"{command[1].lower()}-value\n".encode())
+
+    mock_subprocess.side_effect = run
+
+    provider = VaultKeyProvider()
+    assert provider.get_keys(["FIRST_KEY", "SECOND_KEY", "MISSING_KEY"]) == {
+        "FIRST_KEY": "first_key-value",
+        "SECOND_KEY": "second_key-value",
+    }
+    assert mock_subprocess.call_count == 3
+
+
+# Test the vault provider reuses keys it already retrieved
+@patch("subprocess.run")
+def test_vault_provider_caches_keys(mock_subprocess):
+    mock_subprocess.return_value = MagicMock(stdout=b"vault-value\n")
+
+    provider = VaultKeyProvider()
+    assert provider.get_key("VAULT_KEY") == "vault-value"
+    assert provider.get_key("VAULT_KEY") == "vault-value"
+    mock_subprocess.assert_called_once()
+
+    # Keys expire after the configured TTL
+    provider = VaultKeyProvider(cache_ttl=0)
+    provider.get_key("VAULT_KEY")
+    provider.get_key("VAULT_KEY")
+    assert mock_subprocess.call_count == 3
+
+
+# Test concurrent lookups of the same key share one vault call
+@patch("subprocess.run")
+def test_vault_provider_single_flight(mock_subprocess):
+    release = threading.Event()
+
+    def run(command, **kwargs):
+        release.wait(timeout=5)
+        return MagicMock(stdout=b"vault-value\n")
+
+    mock_subprocess.side_effect = run
+
+    provider = VaultKeyProvider()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(provider.get_key, "VAULT_KEY") for _ in range(4)]
+        time.sleep(0.1)
+        release.set()
+        assert [f.result() for f in futures] == ["vault-value"] * 4
+    mock_subprocess.assert_called_once()
+
+
+# Test the CLI providers return the value their command prints
+@pytest.mark.parametrize(
+    "provider_cls, provider_name, outputs, command, key_name, expected",
+    [
+        (
+            OnePasswordKeyProvider,
+            "1password",
+            [
+                b'export OP_SESSION_test="session-token"\n',
+                b'{"TEST_KEY": "secret-value"}',
+            ],
+            ["op", "run", "--env-file=/tmp/.env"],
+            "TEST_KEY",
+            "secret-value",
+        ),
+        (
+            LastPassKeyProvider,
+            "lastpass",
+            [b"lastpass-secret-value"],
+            ["olp", "LASTPASS_KEY"],
+            "LASTPASS_KEY",
+            "lastpass-secret-value",
+        ),
+    ],
+)
+@patch("secret_key_manager.providers.onepassword._OP_PATH", "/usr/bin/op")
+@patch("secret_key_manager.providers.lastpass._OLP_PATH", "/usr/bin/olp")
+@patch(
+    "secret_key_manager.providers.onepassword._load_config",
+    return_value={"account": "test.1password.com", "env_file": "/tmp/.env"},
+)
+@patch("subprocess.run")
+def test_cli_provider_get_key(
+    mock_subprocess,
+    mock_load_config,
+    completed_process,
+    provider_cls,
+    provider_name,
+    outputs,
+    command,
+    key_name,
+    expected,
+):
+    mock_subprocess.side_effect = [completed_process(stdout) for stdout in outputs]
+
+    provider = provider_cls()
+    assert provider.name == provider_name
+    assert provider.get_key(key_name) == expected
+
+    # Every command output was used, and nothing else was run
+    assert mock_subprocess.call_count == len(outputs)
+    # The lookup itself ran the expected command
+    assert mock_subprocess.call_args[0][0][: len(command)] == command
+
+
+# Test the CLI providers refuse to start when their command is missing
+@patch("secret_key_manager.providers.onepassword._OP_PATH", None)
+@patch("secret_key_manager.providers.lastpass._OLP_PATH", None)
+@patch("subprocess.run")
+def test_cli_providers_not_installed(mock_subprocess):
+    with pytest.raises(RuntimeError):
+        OnePasswordKeyProvider()
+    with pytest.raises(RuntimeError):
+        LastPassKeyProvider()
+    mock_subprocess.assert_not_called()
 
 
 # Test DotEnv provider if python-dotenv is installed
 @pytest.mark.skipif(not HAS_DOTENV, reason="python-dotenv not installed")
-def test_dotenv_provider():
+def test_dotenv_provider(tmp_path):
     """Test the DotEnv provider if dotenv is available."""
-    with tempfile.NamedTemporaryFile(suffix=".env", mode="w+") as temp_env:
-        # Create a test .env file
-        temp_env.write("DOTENV_TEST_KEY=dotenv-secret-value\n")
-        temp_env.flush()
-
-        # Create patches for dotenv functions
-        with (
-            patch("dotenv.load_dotenv", return_value=True),
+    # Create a test .env file
+    temp_env = tmp_path / ".env"
+    temp_env.write_text("DOTENV_TEST_KEY=dotenv-secret-value\n")
+
+    # Create patches for dotenv functions
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(
             patch(
                 "dotenv.dotenv_values",
                 return_value={"DOTENV_TEST_KEY": "dotenv-secret-value"},
-            ),
-            patch("dotenv.set_key", return_value=None),
-            patch.dict("os.environ", {"DOTENV_TEST_KEY": "dotenv-secret-value"}),
-        ):
-            # Create provider instance
-            provider = DotEnvProvider(file_path=temp_env.name)
+            )
+        )
+        stack.enter_context(patch("dotenv.set_key", return_value=None))
+        stack.enter_context(
+            patch.dict("os.environ", {"DOTENV_TEST_KEY": "dotenv-secret-value"})
+        )
 
-            # Test key retrieval
-            result = provider.get_key("DOTENV_TEST_KEY")
-            assert result == "dotenv-secret-value"
+        # Create provider instance
+        provider = DotEnvProvider(file_path=str(temp_env))
 
-            # Test write support
-            assert provider.supports_write() is True
+        # Test key retrieval
+        result = provider.get_key("DOTENV_TEST_KEY")
+        assert result == "dotenv-secret-value"
 
-            # Test writing a key
-            write_result = provider.write_key("NEW_KEY", "new-value")
-            assert write_result is True
+        # Test write support
+        assert provider.supports_write() is True
 
-            # Verify provider name
-            assert provider.name == "dotenv"
+        # Test writing a key
+        write_result = provider.write_key("NEW_KEY", "new-value")
+        assert write_result is True
 
-            # Test provider info
-            info = provider.get_provider_info()
-            assert info["name"] == "dotenv"
-            assert info["supports_write"] is True
-            assert temp_env.name in info["file_path"]
+        # Verify provider name
+        assert provider.name == "dotenv"
+
+        # Test provider info
+        info = provider.get_provider_info()
+        assert info["name"] == "dotenv"
+        assert info["supports_write"] is True
+        assert str(temp_env) in info["file_path"]
+
+
+# Test the DotEnv provider only reads values from its own file
+@pytest.mark.skipif(not HAS_DOTENV, reason="python-dotenv not installed")
+@patch.dict("os.environ", {"DOTENV_EXISTING_KEY": "from-environment"})
+def test_dotenv_provider_reads_file_values(tmp_path):
+    env_file = tmp_path / ".env"
+    env_file.write_text(
+        "DOTENV_FILE_KEY=file-value\nDOTENV_EXISTING_KEY=file-override\n"
+    )
+
+    provider = DotEnvProvider(file_path=str(env_file), load_into_environ=False)
+    assert provider.get_key("DOTENV_FILE_KEY") == "file-value"
+    assert provider.get_key("DOTENV_EXISTING_KEY") == "file-override"
+    assert provider.has_key("PATH") is False
+    assert "DOTENV_FILE_KEY" not in os.environ
+
+    # Exporting keeps variables that are already set
+    DotEnvProvider(file_path=str(env_file))
+    assert os.environ["DOTENV_FILE_KEY"] == "file-value"
+    assert os.environ["DOTENV_EXISTING_KEY"] == "from-environment"
+
+
+# Test the DotEnv provider creates the .env file's directory on first write
+@pytest.mark.skipif(not HAS_DOTENV, reason="python-dotenv not installed")
+def test_dotenv_provider_write_creates_directory(tmp_path):
+    env_file = tmp_path / "config" / ".env"
+    provider = DotEnvProvider(file_path=str(env_file), load_into_environ=False)
+
+    assert provider.write_key("FIRST_KEY", "first-value") is True
+    assert provider.write_key("SECOND_KEY", "second-value") is True
+
+    assert provider.get_key("FIRST_KEY") == "first-value"
+    assert provider.get_key("SECOND_KEY") == "second-value"
+    assert "SECOND_KEY='second-value'" in env_file.read_text()
+
+
+# Test the keyring provider builds its info only once
+@pytest.mark.skipif(not HAS_KEYRING, reason="keyring not installed")
+@patch("keyring.get_keyring")
+def test_keyring_provider_info(mock_get_keyring):
+    class FakeBackend:
+        pass
+
+    mock_get_keyring.return_value = FakeBackend()
+    provider = KeyringProvider(service_name="test-service")
+
+    info = provider.get_provider_info()
+    assert info["name"] == "keyring"
+    assert info["supports_write"] is True
+    assert info["service_name"] == "test-service"
+    assert info["backend"] == "FakeBackend"
+
+    assert provider.get_provider_info() is info
+    mock_get_keyring.assert_called_once_with()
+
+    # The info is shared, so it can't be changed by callers
+    with pytest.raises(TypeError):
+        info["backend"] = "OtherBackend"
+
+
+# Test the keyring provider caches keys and keeps the cache current on writes
+@pytest.mark.skipif(not HAS_KEYRING, reason="keyring not installed")
+@patch("keyring.set_password")
+@patch("keyring.get_password", return_value="stored-value")
+def test_keyring_provider_caches_keys(mock_get_password, mock_set_password):
+    provider = KeyringProvider(service_name="test-service")
+
+    assert provider.get_key("KEYRING_KEY") == "stored-value"
+    assert provider.get_key("KEYRING_KEY") == "stored-value"
+    mock_get_password.assert_called_once_with("test-service", "KEYRING_KEY")
+
+    assert provider.write_key("KEYRING_KEY", "new-value") is True
+    mock_set_password.assert_called_once_with(
+        "test-service", "KEYRING_KEY", "new-value"
+    )
+    assert provider.get_key("KEYRING_KEY") == "new-value"
+
+    # Other services are cached separately
+    assert provider.get_key("KEYRING_KEY", service_name="other") == "stored-value"
+    assert mock_get_password.call_count == 2